@@ -0,0 +1,273 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+import bench_common
+import bench_generators as gen
+import os
+import subprocess
+import sys
+
+cases = {}
+
+def bench_case(name):
+	def register(func):
+		cases[name] = func
+		return func
+	return register
+
+def make_reader(data):
+	from external.easybinrw import easybinrw
+	reader = easybinrw.binread()
+	reader.load_data(data)
+	return reader
+
+def scalar_read_case(funcname, typecode):
+	def setup(scale):
+		count = 100000*scale
+		data = gen.gen_scalars(count, typecode)
+		def run():
+			func = getattr(make_reader(data), funcname)
+			for _ in range(count): func()
+		return run, len(data), count
+	return setup
+
+bench_case('binread.int_u16')(scalar_read_case('int_u16', 'H'))
+bench_case('binread.int_u32')(scalar_read_case('int_u32', 'I'))
+bench_case('binread.int_s64')(scalar_read_case('int_s64', 'q'))
+bench_case('binread.float')(scalar_read_case('float', 'f'))
+bench_case('binread.double')(scalar_read_case('double', 'd'))
+
+def list_read_case(funcname, typecode, listsize):
+	def setup(scale):
+		count = 1000*scale
+		data = gen.gen_scalars(count*listsize, typecode)
+		def run():
+			func = getattr(make_reader(data), funcname)
+			for _ in range(count): func(listsize)
+		return run, len(data), count
+	return setup
+
+bench_case('binread.list_int_u8.small')(list_read_case('list_int_u8', 'B', 16))
+bench_case('binread.list_int_s16.large')(list_read_case('list_int_s16', 'h', 4096))
+bench_case('binread.list_float.small')(list_read_case('list_float', 'f', 16))
+bench_case('binread.list_double.large')(list_read_case('list_double', 'd', 4096))
+
+@bench_case('binread.string_t')
+def binread_string_t(scale):
+	count = 20000*scale
+	data = gen.gen_strings(count)
+	def run():
+		func = make_reader(data).string_t
+		for _ in range(count): func()
+	return run, len(data), count
+
+@bench_case('binread.varint')
+def binread_varint(scale):
+	count = 20000*scale
+	data = gen.gen_varints(count)
+	def run():
+		func = make_reader(data).varint
+		for _ in range(count): func()
+	return run, len(data), count
+
+def scalar_write_case(funcname, typecode):
+	def setup(scale):
+		from external.easybinrw import easybinrw
+		from array import array
+		count = 100000*scale
+		values = array(typecode, gen.gen_scalars(count, typecode)).tolist()
+		def run():
+			writer = easybinrw.binwrite()
+			func = getattr(writer, funcname)
+			for x in values: func(x)
+			return writer.getvalue()
+		return run, len(values)*array(typecode).itemsize, count
+	return setup
+
+bench_case('binwrite.int_u16')(scalar_write_case('int_u16', 'H'))
+bench_case('binwrite.int_u32')(scalar_write_case('int_u32', 'I'))
+bench_case('binwrite.float')(scalar_write_case('float', 'f'))
+bench_case('binwrite.double')(scalar_write_case('double', 'd'))
+
+def list_write_case(funcname, typecode, listsize):
+	def setup(scale):
+		from external.easybinrw import easybinrw
+		import numpy as np
+		count = 1000*scale
+		values = np.frombuffer(gen.gen_scalars(listsize, typecode), typecode)
+		def run():
+			writer = easybinrw.binwrite()
+			func = getattr(writer, funcname)
+			for _ in range(count): func(values, listsize)
+			return writer.getvalue()
+		return run, values.nbytes*count, count
+	return setup
+
+bench_case('binwrite.list_int_s32.small')(list_write_case('list_int_s32', 'i', 16))
+bench_case('binwrite.list_int_s32.large')(list_write_case('list_int_s32', 'i', 4096))
+bench_case('binwrite.list_float.large')(list_write_case('list_float', 'f', 4096))
+
+@bench_case('riff.read')
+def riff_read(scale):
+	from external.easybinrw import riff_chunks
+	data = gen.gen_wave_riff(2000*scale, 100000*scale)
+	def run():
+		riff_data = riff_chunks.riff_chunk()
+		riff_data.read(make_reader(data), True)
+		return riff_data
+	return run, len(data), 1
+
+@bench_case('riff.read_view')
+def riff_read_view(scale):
+	from external.easybinrw import riff_chunks
+	data = gen.gen_wave_riff(2000*scale, 100000*scale)
+	def run():
+		riff_data = riff_chunks.riff_chunk()
+		riff_data.read(make_reader(data), 'view')
+		return riff_data
+	return run, len(data), 1
+
+@bench_case('riff.write_data')
+def riff_write_data(scale):
+	from external.easybinrw import riff_chunks
+	data = gen.gen_wave_riff(2000*scale, 100000*scale)
+	riff_data = riff_chunks.riff_chunk()
+	riff_data.read(make_reader(data), True)
+	def run(): return riff_data.write_data()
+	return run, len(data), 1
+
+@bench_case('chunked.read_all_iso')
+def chunked_read_all_iso(scale):
+	from external.easybinrw import chunked
+	count = 20000*scale
+	data = gen.gen_chunks(count)
+	def run():
+		reader = make_reader(data)
+		for part_obj in chunked.chunk_part_read_all_iso(reader, None): reader.rest()
+	return run, len(data), count
+
+gumboy_ddef = os.path.join(bench_common.repo_root, 'example', 'gumboy_map.ddef')
+
+def load_gumboy(use_compiled):
+	from external.easybinrw import datadef
+	dataset = datadef.datadef_file()
+	dataset.load_from_file(gumboy_ddef)
+	dataset.use_compiled = use_compiled
+	return dataset
+
+@bench_case('datadef.parse_data')
+def datadef_parse_data(scale):
+	dataset = load_gumboy(True)
+	numheader = 20000*scale
+	data = gen.gen_gumboy(numheader)
+	def run(): return dataset.parse_data(data, 'main')
+	return run, len(data), numheader
+
+@bench_case('datadef.parse_data.interpreted')
+def datadef_parse_data_interpreted(scale):
+	dataset = load_gumboy(False)
+	numheader = 2000*scale
+	data = gen.gen_gumboy(numheader)
+	def run(): return dataset.parse_data(data, 'main')
+	return run, len(data), numheader
+
+@bench_case('datadef.dump_bytes')
+def datadef_dump_bytes(scale):
+	dataset = load_gumboy(True)
+	numheader = 20000*scale
+	data = gen.gen_gumboy(numheader)
+	value = dataset.parse_data(data, 'main')
+	def run(): return dataset.dump_bytes('main', value)
+	return run, len(data), numheader
+
+def run_script(code):
+	code = 'import sys; sys.path.insert(0, %r); import bench_common; ' % os.path.dirname(os.path.abspath(__file__)) + code
+	return subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout.strip()
+
+def import_case(modulename):
+	def setup(scale):
+		code = 'pass'
+		if modulename: code = 'from external.easybinrw import %s; print(*sorted(set(["numpy", "varint"]) & set(sys.modules)))' % modulename
+		def run():
+			out = run_script(code)
+			if out: raise RuntimeError('importing %s also imported %s' % (modulename, out))
+		return run, 0, 1
+	return setup
+
+bench_case('import.python')(import_case(None))
+bench_case('import.easybinrw')(import_case('easybinrw'))
+bench_case('import.chunked')(import_case('chunked'))
+bench_case('import.riff_chunks')(import_case('riff_chunks'))
+bench_case('import.datadef')(import_case('datadef'))
+
+@bench_case('datadef.parse_data.scalar_no_numpy')
+def datadef_parse_data_scalar_no_numpy(scale):
+	code = 'from external.easybinrw import datadef; from struct import pack; dataset = datadef.datadef_file(); dataset.load_from_file(%r); '
+	code += 'assert dataset.parse_data(pack("<I", 0), "prop_part") == {"prop_type": 0}; print(*sorted(set(["numpy"]) & set(sys.modules)))'
+	code = code % gumboy_ddef
+	def run():
+		out = run_script(code)
+		if out: raise RuntimeError('scalar compiled parse imported %s' % out)
+	return run, 0, 1
+
+def load_case(use_cache, subprocess_run):
+	def setup(scale):
+		from external.easybinrw import datadef
+		import tempfile
+		cache_dir = os.path.join(tempfile.gettempdir(), 'easybinrw_bench_cache') if use_cache else None
+		if use_cache: datadef.datadef_file().load_from_file(gumboy_ddef, cache_dir)
+		code = 'from external.easybinrw import datadef; dataset = datadef.datadef_file(); dataset.load_from_file(%r, %r); dataset.get_compiled(0)' % (gumboy_ddef, cache_dir)
+		def run():
+			if subprocess_run: run_script(code)
+			else:
+				dataset = datadef.datadef_file()
+				dataset.load_from_file(gumboy_ddef, cache_dir)
+				dataset.get_compiled(0)
+		return run, os.path.getsize(gumboy_ddef), 1
+	return setup
+
+bench_case('datadef.load.xml')(load_case(False, False))
+bench_case('datadef.load.cache')(load_case(True, False))
+bench_case('datadef.load.xml.cold')(load_case(False, True))
+bench_case('datadef.load.cache.cold')(load_case(True, True))
+
+@bench_case('binread.find')
+def binread_find(scale):
+	data = gen.gen_disk_image(16000000*scale, 200)
+	def run():
+		reader = make_reader(data)
+		pos = reader.find(b'RIFF', 0)
+		while pos != -1: pos = reader.find(b'RIFF', pos+1)
+	return run, len(data), 1
+
+@bench_case('binread.finditer')
+def binread_finditer(scale):
+	data = gen.gen_disk_image(16000000*scale, 200)
+	def run():
+		for _ in make_reader(data).finditer([b'RIFF', b'RF64', b'LIST'], 0): pass
+	return run, len(data), 1
+
+def compressed_case(codec, sequential):
+	def setup(scale):
+		from external.easybinrw import easybinrw
+		import bz2
+		import random
+		import zlib
+		data = gen.gen_wave_riff(2000*scale, 400000*scale)
+		packed = {'zlib': zlib, 'bz2': bz2}[codec].compress(data)
+		offsets = random.Random(1).sample(range(len(data)-64), 1000)
+		def run():
+			reader = easybinrw.binread()
+			reader.load_compressed(packed, codec)
+			if sequential: reader.rest()
+			else:
+				for x in offsets:
+					reader.seek(x)
+					reader.read(64)
+		return run, len(data), 1 if sequential else len(offsets)
+	return setup
+
+bench_case('binread.compressed.zlib.rest')(compressed_case('zlib', True))
+bench_case('binread.compressed.zlib.random')(compressed_case('zlib', False))
+bench_case('binread.compressed.bz2.random')(compressed_case('bz2', False))
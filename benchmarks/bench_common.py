@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+import os
+import sys
+import types
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def setup_import():
+	package = sys.modules.get('external.easybinrw')
+	if package is not None and list(getattr(package, '__path__', [])) == [repo_root]: return
+	external = types.ModuleType('external')
+	external.__path__ = []
+	package = types.ModuleType('external.easybinrw')
+	package.__path__ = [repo_root]
+	external.easybinrw = package
+	sys.modules['external'] = external
+	sys.modules['external.easybinrw'] = package
+
+setup_import()
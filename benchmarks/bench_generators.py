@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+import bench_common
+from external.easybinrw import easybinrw
+from array import array
+import random
+
+def gen_scalars(count, typecode, seed=1):
+	rnd = random.Random(seed)
+	if typecode in 'fd': values = array(typecode, [rnd.random() for _ in range(count)])
+	else:
+		bits = array(typecode).itemsize*8
+		values = array(typecode, [rnd.getrandbits(bits-1) for _ in range(count)])
+	return values.tobytes()
+
+def gen_strings(count, seed=1):
+	rnd = random.Random(seed)
+	letters = b'abcdefghijklmnopqrstuvwxyz_0123456789'
+	return b''.join([bytes(rnd.choices(letters, k=rnd.randrange(1, 32)))+b'\x00' for _ in range(count)])
+
+def gen_varints(count, seed=1):
+	rnd = random.Random(seed)
+	writer = easybinrw.binwrite()
+	for _ in range(count): writer.varint(rnd.getrandbits(rnd.randrange(1, 40)))
+	return writer.getvalue()
+
+def riff_chunk_bytes(idtxt, payload):
+	return idtxt+len(payload).to_bytes(4, 'little')+payload+(b'\x00' if len(payload)%2 else b'')
+
+def riff_list_bytes(listid, idtxt, children):
+	return riff_chunk_bytes(listid, idtxt+b''.join(children))
+
+def gen_wave_riff(numcues, numframes, channels=2, seed=1):
+	rnd = random.Random(seed)
+	fmt = (1).to_bytes(2, 'little')+channels.to_bytes(2, 'little')+(44100).to_bytes(4, 'little')
+	fmt += (44100*channels*2).to_bytes(4, 'little')+(channels*2).to_bytes(2, 'little')+(16).to_bytes(2, 'little')
+	info = [riff_chunk_bytes(x, b'benchmark text %i\x00' % num) for num, x in enumerate([b'INAM', b'IART', b'ICMT', b'ISFT'])]
+	labels = [riff_chunk_bytes(b'labl', num.to_bytes(4, 'little')+b'cue point %i\x00' % num) for num in range(numcues)]
+	cues = b''.join([num.to_bytes(4, 'little')+rnd.randrange(numframes).to_bytes(4, 'little')+b'data'+bytes(12) for num in range(numcues)])
+	children = [
+		riff_chunk_bytes(b'fmt ', fmt),
+		riff_list_bytes(b'LIST', b'INFO', info),
+		riff_chunk_bytes(b'cue ', numcues.to_bytes(4, 'little')+cues),
+		riff_list_bytes(b'LIST', b'adtl', labels),
+		riff_chunk_bytes(b'data', gen_scalars(numframes*channels, 'h', seed)),
+		]
+	return riff_list_bytes(b'RIFF', b'WAVE', children)
+
+def gen_chunks(count, seed=1):
+	rnd = random.Random(seed)
+	writer = easybinrw.binwrite()
+	for num in range(count):
+		size = rnd.randrange(4, 64)
+		writer.raw(b'CH%02i' % (num%100))
+		writer.int_u32(size)
+		writer.raw(bytes(rnd.getrandbits(8) for _ in range(size)))
+	return writer.getvalue()
+
+def write_prop(writer, prop_type):
+	writer.int_u32(prop_type)
+	if prop_type == 9:
+		writer.float(1); writer.float(2)
+		writer.int_u8(1); writer.raw(b'\x01\x02\x03\x04')
+		writer.int_u8(0); writer.raw(b'\x05\x06\x07\x08')
+		writer.int_u32(3); writer.int_u32(4); writer.int_u16(5)
+	elif prop_type == 4:
+		writer.float(0.5); writer.int_u32(7); writer.string_i32('texture')
+		writer.int_u8(1)
+		for x in range(5): writer.float(x)
+		writer.int_u32(9)
+	elif prop_type == 10:
+		writer.int_u32(1); writer.raw_i32(b'prop data')
+	elif prop_type == 1:
+		writer.int_u32(4); writer.raw(b'\x01\x00\x01\x00')
+		writer.raw_i32(b'cmds1'); writer.raw_i32(b'cmds3')
+	elif prop_type == 8:
+		writer.int_u8(0)
+		for x in range(6): writer.int_s32(x)
+		writer.int_u32(1); writer.int_u32(8); writer.raw(b'sidewalk')
+		writer.float(1); writer.float(2); writer.float(3); writer.int_s32(4); writer.int_s32(5)
+
+def gen_gumboy(numheader, seed=1, props=(9, 4, 10, 1, 8, 0, 9)):
+	rnd = random.Random(seed)
+	w = easybinrw.binwrite()
+	w.string_i8('GUMBOY'); w.raw_i8(b'\x01\x02'); w.raw(bytes(4))
+	for _ in range(4): w.int_u32(rnd.randrange(1000))
+	w.int_u8(1); w.int_u8(2); w.float(1.5); w.float(2.5); w.int_u32(3); w.float(0.25); w.int_u8(4); w.int_u8(5); w.int_u32(6)
+	w.string_i32('level name'); w.string_i32('author')
+	w.int_u32(5)
+	for x in range(5): w.int_u32(x)
+	w.raw(bytes(32)); w.raw(bytes(4)); w.int_u32(7); w.int_u8(8)
+	for _ in range(4): w.int_u32(9)
+	for _ in range(3): w.float(1.0)
+	w.raw(bytes(4)); w.int_u8(1); w.int_u32(2)
+	for _ in range(4): w.float(2.0)
+	w.raw(bytes(4)); w.int_u8(1); w.int_u32(2); w.raw(bytes(8)); w.int_u8(1); w.int_u32(1); w.int_u32(1); w.float(3.0); w.float(4.0); w.raw(bytes(8))
+	for x in ['a', 'bb', 'ccc', 'dddd']: w.string_i32(x)
+	w.raw(bytes(8))
+	for _ in range(14): w.int_u32(rnd.randrange(100))
+	w.int_u16(1); w.int_s32(-1); w.int_s32(-2); w.int_u16(2)
+	for _ in range(5): w.int_u32(3)
+	w.raw(bytes(5))
+	w.int_u32(numheader)
+	for _ in range(numheader):
+		for _ in range(26): w.float(rnd.random())
+	w.int_u32(0)
+	for _ in range(4):
+		for _ in range(10): w.float(rnd.random())
+		w.raw(bytes(38))
+	w.int_u32(1); w.int_u32(2); w.string_i32('object')
+	for x in [1, 0, 0, 0, 0]: w.int_u8(x)
+	w.string_i32('path/to/thing'); w.int_s32(1); w.int_s32(2)
+	for x in props: write_prop(w, x)
+	w.raw(bytes(256))
+	return w.getvalue()
+
+def gen_disk_image(size, numblobs, seed=1):
+	rnd = random.Random(seed)
+	image = bytearray(rnd.getrandbits(8) for _ in range(4096))*(size//4096)
+	blob = gen_wave_riff(4, 256, 1, seed)
+	offsets = sorted(rnd.sample(range(0, len(image)-len(blob), 2), numblobs))
+	for x in offsets: image[x:x+len(blob)] = blob
+	return bytes(image)
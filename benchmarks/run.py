@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+import bench_common
+import bench_cases
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+
+RESULTS_VERSION = 1
+
+def run_case(name, scale, repeat, mintime):
+	run, numbytes, numops = bench_cases.cases[name](scale)
+	run()
+	times = []
+	while len(times) < repeat or sum(times) < mintime:
+		starttime = time.perf_counter()
+		run()
+		times.append(time.perf_counter()-starttime)
+	best = min(times)
+	return {
+		'min': best,
+		'median': statistics.median(times),
+		'mean': statistics.fmean(times),
+		'runs': len(times),
+		'bytes': numbytes,
+		'ops': numops,
+		'mb_per_s': numbytes/best/1000000 if best else None,
+		'ns_per_op': best/numops*1e9 if numops else None,
+		}
+
+def get_meta(scale, repeat):
+	meta = {
+		'version': RESULTS_VERSION,
+		'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+		'python': sys.version.split()[0],
+		'implementation': sys.implementation.name,
+		'platform': platform.platform(),
+		'machine': platform.machine(),
+		'scale': scale,
+		'repeat': repeat,
+		}
+	try:
+		import numpy
+		meta['numpy'] = numpy.__version__
+	except ImportError: pass
+	return meta
+
+def compare(results, baseline, threshold):
+	out = {}
+	for name, result in results.items():
+		if name not in baseline or 'min' not in result or 'min' not in baseline[name]: continue
+		ratio = result['min']/baseline[name]['min'] if baseline[name]['min'] else None
+		if ratio is None: status = 'unknown'
+		elif ratio > 1+threshold: status = 'regression'
+		elif ratio < 1-threshold: status = 'improvement'
+		else: status = 'same'
+		out[name] = {'ratio': ratio, 'status': status, 'baseline_min': baseline[name]['min']}
+	return out
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='easybinrw benchmark runner')
+	parser.add_argument('patterns', nargs='*', help='glob patterns of benchmark names to run (default: all)')
+	parser.add_argument('--list', action='store_true', help='list benchmark names and exit')
+	parser.add_argument('--scale', type=int, default=1, help='multiplier for generated data sizes')
+	parser.add_argument('--repeat', type=int, default=5, help='minimum timed runs per benchmark')
+	parser.add_argument('--min-time', type=float, default=0.2, help='minimum total timed seconds per benchmark')
+	parser.add_argument('--output', '-o', help='write results JSON to this file')
+	parser.add_argument('--baseline', '-b', help='compare against a results JSON written by --output')
+	parser.add_argument('--threshold', type=float, default=0.10, help='relative slowdown reported as a regression')
+	parser.add_argument('--fail-on-regression', action='store_true', help='exit with status 1 when a regression is found')
+	args = parser.parse_args(argv)
+
+	names = list(bench_cases.cases)
+	if args.patterns: names = [x for x in names if any(fnmatch.fnmatch(x, p) for p in args.patterns)]
+	if args.list:
+		for name in names: print(name)
+		return 0
+
+	baseline = None
+	if args.baseline:
+		with open(args.baseline) as f: baseline = json.load(f)['results']
+
+	results = {}
+	for name in names:
+		try: results[name] = run_case(name, args.scale, args.repeat, args.min_time)
+		except ImportError as e: results[name] = {'skipped': str(e)}
+		except Exception as e: results[name] = {'error': '%s: %s' % (type(e).__name__, e)}
+		result = results[name]
+		if 'skipped' in result: print('%-36s skipped: %s' % (name, result['skipped']))
+		elif 'error' in result: print('%-36s error: %s' % (name, result['error']))
+		else: print('%-36s %10.3f ms %10.1f MB/s %10.1f ns/op' % (name, result['min']*1000, result['mb_per_s'] or 0, result['ns_per_op'] or 0))
+
+	output = {'meta': get_meta(args.scale, args.repeat), 'results': results}
+	regressions = []
+	if baseline is not None:
+		output['comparison'] = compare(results, baseline, args.threshold)
+		print()
+		for name, c in output['comparison'].items():
+			print('%-36s %6.2fx  %s' % (name, c['ratio'] or 0, c['status']))
+			if c['status'] == 'regression': regressions.append(name)
+
+	if args.output:
+		with open(args.output, 'w') as f: json.dump(output, f, indent=1)
+	if [x for x in results.values() if 'error' in x]: return 1
+	if regressions and args.fail_on_regression: return 1
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -3,22 +3,69 @@
 # easybinrw is MIT
 
 from external.easybinrw import easybinrw
-import numpy as np
+from struct import Struct
+import marshal
+import os
+import sys
+from array import array
+from time import perf_counter
+from collections.abc import Mapping, Sequence
+
+DATADEF_CACHE_VERSION = 3
+DATADEF_SOURCE_HASH = None
 
 DEBUGTXT = 0
 
+scalar_codes = {
+	'int_s16': 'h',
+	'int_u16': 'H',
+	'int_s32': 'i',
+	'int_u32': 'I',
+	'int_s64': 'q',
+	'int_u64': 'Q',
+	'float': 'f',
+	'double': 'd',
+	}
+
+list_bintypes = ['int_s8', 'int_u8']
+for x in scalar_codes: list_bintypes += [x, x+'_b', x+'_l']
+
+size_bintypes = ['int_u8']
+for x in ['int_u16', 'int_u32', 'int_u64']: size_bintypes += [x, x+'_b', x+'_l']
+
+def scalar_format(bintype, endian):
+	if bintype == 'int_s8': return 'b'
+	if bintype == 'int_u8': return 'B'
+	if bintype in scalar_codes: return ('>' if endian else '<')+scalar_codes[bintype]
+	if bintype[-2:] in ['_b', '_l'] and bintype[:-2] in scalar_codes:
+		return ('>' if bintype[-2:]=='_b' else '<')+scalar_codes[bintype[:-2]]
+
+def fields_tree(fields):
+	tree = {}
+	for path in fields:
+		names = path.replace('[*]', '').split('.')
+		node = tree
+		for name in names[:-1]:
+			if name in node and node[name] is None: break
+			node = node.setdefault(name, {})
+		else: node[names[-1]] = None
+	return tree
+
+def fields_key(tree):
+	if tree is None: return None
+	return tuple(sorted([(k, fields_key(v)) for k, v in tree.items()]))
+
 def printtab(state, a, b, c, val):
-	if DEBUGTXT: 
-		print('    '*state.tabnum, end='')
-		if a is not None: print(a, '-', end=' ')
-		if b is not None: print(b, '-', end=' ')
-		if c is not None: print(c, end=' ')
-		if val is not None:
-			if type(val) not in [dict, list]: 
-				if isinstance(val, bytes): print('-', val.hex())
-				else: print('-', val)
-			else: print()
+	print('    '*state.tabnum, end='')
+	if a is not None: print(a, '-', end=' ')
+	if b is not None: print(b, '-', end=' ')
+	if c is not None: print(c, end=' ')
+	if val is not None:
+		if type(val) not in [dict, list]: 
+			if isinstance(val, bytes): print('-', val.hex())
+			else: print('-', val)
 		else: print()
+	else: print()
 
 class datadef_match:
 	def __init__(self):
@@ -27,6 +74,7 @@ class datadef_match:
 		self.name = None
 		self.parts = datadef_partlist()
 		self.mode = 'eq'
+		self.match_int = None
 
 	def read(self, xml_obj):
 		self.type = xml_obj.tag
@@ -36,21 +84,44 @@ class datadef_match:
 			elif k=='name': self.name = v
 			elif k=='mode': self.mode = v
 			else: print('unsupported match attrib:', k)
+		if self.bintype and self.bintype.startswith('int'):
+			try: self.match_int = int(self.match_value)
+			except (TypeError, ValueError): print('match_value must be an integer:', self.match_value)
 		for x in xml_obj:
-			self.parts.read_part(x)
+			self.parts.read_parts(x)
 
 	def match(self, val):
-		if self.bintype == 'int':
-			if self.mode=='eq': return int(self.match_value)==val
-			if self.mode=='ne': return int(self.match_value)!=val
-			if self.mode=='hi': return int(self.match_value)<val
-			if self.mode=='lo': return int(self.match_value)>val
+		if self.match_int is not None:
+			if self.mode=='eq': return self.match_int==val
+			if self.mode=='ne': return self.match_int!=val
+			if self.mode=='hi': return self.match_int<val
+			if self.mode=='lo': return self.match_int>val
+
+	def is_jumpable(self):
+		return self.mode == 'eq' and self.match_int is not None and not self.parts.writes_key(self.name)
 
 	def parse(self, state, outval):
 		omatch = self.match(outval[self.name])
 		if omatch:
 			return self.parts.parse(state, outval, debugsource='match')
 
+class datadef_jump:
+	def __init__(self, match_obj):
+		self.name = match_obj.name
+		self.matches = [match_obj]
+		self.table = {match_obj.match_int: match_obj.parts}
+
+	def add(self, match_obj):
+		if match_obj.name != self.name or match_obj.match_int in self.table: return False
+		self.matches.append(match_obj)
+		self.table[match_obj.match_int] = match_obj.parts
+		return True
+
+	def parse(self, state, outval):
+		partlist = self.table.get(outval[self.name])
+		if partlist is not None:
+			return partlist.parse(state, outval, debugsource='match')
+
 class datadef_part:
 	def __init__(self):
 		self.type = None
@@ -101,13 +172,13 @@ class datadef_part:
 
 		if size>-1:
 			if self.list_bintype == 'dict':
-				printtab(state, '>> LIST_START', None, None, None)
+				if DEBUGTXT: printtab(state, '>> LIST_START', None, None, None)
 				listd = []
 				for _ in range(size):
 					ioutval = {}
 					self.parts.parse(state, ioutval, debugsource='dict')
 					listd.append(ioutval)
-				printtab(state, '<< LIST_END', None, None, None)
+				if DEBUGTXT: printtab(state, '<< LIST_END', None, None, None)
 				return listd
 
 			elif self.list_bintype == 'int_s8': return reader.list_int_s8(size)
@@ -139,24 +210,39 @@ class datadef_part:
 			elif self.list_bintype == 'struct':
 				outd = []
 				for _ in range(size):
-					printtab(state, '>> LIST_STRUCT_START', None, None, None)
+					if DEBUGTXT: printtab(state, '>> LIST_STRUCT_START', None, None, None)
 					outv = {}
 					d = state.parse_struct(self.struct_name, outv)
 					outd.append(outv)
-					printtab(state, '<< LIST_STRUCT_END', None, None, None)
+					if DEBUGTXT: printtab(state, '<< LIST_STRUCT_END', None, None, None)
 				return outd
 		if size==-1:
 			if self.list_bintype == 'struct':
 				outd = []
 				while True:
 					outv = {}
-					printtab(state, '>> LIST_STRUCT_START', None, None, None)
+					if DEBUGTXT: printtab(state, '>> LIST_STRUCT_START', None, None, None)
 					exitval = state.parse_struct(self.struct_name, outv)
-					printtab(state, '<< LIST_STRUCT_END', None, None, None)
+					if DEBUGTXT: printtab(state, '<< LIST_STRUCT_END', None, None, None)
 					outd.append(outv)
 					if exitval=='BREAK': break
 				return outd
 
+	def iter_value_list(self, state, outval):
+		size = self.read_lenval(state, outval)
+		if self.list_bintype in ['dict', 'struct'] and size >= -1:
+			num = 0
+			while size == -1 or num < size:
+				ioutval = {}
+				if self.list_bintype == 'dict': exitval = self.parts.parse(state, ioutval, debugsource='dict')
+				else: exitval = state.parse_struct(self.struct_name, ioutval)
+				yield ioutval
+				num += 1
+				if size == -1 and exitval == 'BREAK': break
+		elif size > -1:
+			listd = self.read_value_list(state, outval)
+			if listd is not None: yield from listd
+
 	def read_value_size(self, state, outval):
 		reader = state.reader
 		if self.bintype == 'int_u8': return reader.int_u8()
@@ -208,10 +294,10 @@ class datadef_part:
 		elif self.bintype == 'string16': return reader.string16(self.read_lenval(state, outval))
 		elif self.bintype == 'string_t': return reader.string_t()
 		elif self.bintype == 'struct': 
-			printtab(state, '>> STRUCT_START', None, None, None)
+			if DEBUGTXT: printtab(state, '>> STRUCT_START', None, None, None)
 			outv = {}
 			state.parse_struct(self.struct_name, outv)
-			printtab(state, '<< STRUCT_END', None, None, None)
+			if DEBUGTXT: printtab(state, '<< STRUCT_END', None, None, None)
 			return outv
 
 		elif self.bintype == 'list': return self.read_value_list(state, outval)
@@ -220,149 +306,78 @@ class datadef_part:
 		if self.type == 'part':
 			name = self.name if self.name else 'unk_%i'%num
 			value = self.read_value(state, outval)
-			printtab(state, 'PART', self.bintype, name, value)
+			if DEBUGTXT: printtab(state, 'PART', self.bintype, name, value)
 			outval[name] = value
 		elif self.type == 'length':
 			if self.name:
 				state.lengths[self.name] = self.read_value_size(state, outval)
-				printtab(state, 'LEN_STORE', self.bintype, self.name, state.lengths[self.name])
+				if DEBUGTXT: printtab(state, 'LEN_STORE', self.bintype, self.name, state.lengths[self.name])
 			else:
 				print('length must have a name')
 
-	def write_size(self, state, inval):
-		writer = state.writer
-		if self.bintype == 'int_u8': writer.int_u8(inval)
-		elif self.bintype == 'int_u16': writer.int_u16(inval)
-		elif self.bintype == 'int_u32': writer.int_u32(inval)
-		elif self.bintype == 'int_u64': writer.int_u64(inval)
-		elif self.bintype == 'int_u16_b': writer.int_u16_b(inval)
-		elif self.bintype == 'int_u32_b': writer.int_u32_b(inval)
-		elif self.bintype == 'int_u64_b': writer.int_u64_b(inval)
-		elif self.bintype == 'int_u16_l': writer.int_u16_l(inval)
-		elif self.bintype == 'int_u32_l': writer.int_u32_l(inval)
-		elif self.bintype == 'int_u64_l': writer.int_u64_l(inval)
-		else: 
-			print('unsupported size type', self.bintype)
-			exit()
+	def dump_count(self, inval):
+		if self.bintype == 'string': return len(str(inval).encode())
+		if self.bintype == 'string16': return len(str(inval).encode('utf-16-le'))//2
+		return len(inval)
 
-	def write_len(self, state, indict, count):
-		if self.size_source == 'manual': return self.size_manual
+	def dump_scalar(self, state, inval, buf, off):
+		packer = state.get_struct(self.bintype)
+		if packer is None: raise ValueError('dump: unsupported size type %s' % self.bintype)
+		if buf is not None: packer.pack_into(buf, off, inval)
+		return off+packer.size
+
+	def dump_len(self, state, indict, inval, buf, off):
+		if self.size_source == 'manual': return self.size_manual, off
 		elif self.size_source == 'part':
-			self.part_size.write_size(state, count)
-			return count
-		elif self.size_source == 'fromkey':
-			d = indict[self.size_local_name]
-			return d
-		else: 
-			print('unsupported length source', self.size_source)
-			exit()
-
-	def write_list(self, state, inval, length):
-		writer = state.writer
-		if length>-1:
-			if self.list_bintype == 'int_s8': writer.list_int_s8(inval, length)
-			elif self.list_bintype == 'int_u8': writer.list_int_u8(inval, length)
-			elif self.list_bintype == 'int_s16': writer.list_int_s16(inval, length)
-			elif self.list_bintype == 'int_u16': writer.list_int_u16(inval, length)
-			elif self.list_bintype == 'int_s32': writer.list_int_s32(inval, length)
-			elif self.list_bintype == 'int_u32': writer.list_int_u32(inval, length)
-			elif self.list_bintype == 'int_s64': writer.list_int_s64(inval, length)
-			elif self.list_bintype == 'int_u64': writer.list_int_u64(inval, length)
-			elif self.list_bintype == 'float': writer.list_float(inval, length)
-			elif self.list_bintype == 'double': writer.list_double(inval, length)
-			elif self.list_bintype == 'int_s16_b': writer.list_int_s16_b(inval, length)
-			elif self.list_bintype == 'int_u16_b': writer.list_int_u16_b(inval, length)
-			elif self.list_bintype == 'int_s32_b': writer.list_int_s32_b(inval, length)
-			elif self.list_bintype == 'int_u32_b': writer.list_int_u32_b(inval, length)
-			elif self.list_bintype == 'int_s64_b': writer.list_int_s64_b(inval, length)
-			elif self.list_bintype == 'int_u64_b': writer.list_int_u64_b(inval, length)
-			elif self.list_bintype == 'float_b': writer.list_float_b(inval, length)
-			elif self.list_bintype == 'double_b': writer.list_double_b(inval, length)
-			elif self.list_bintype == 'int_s16_l': writer.list_int_s16_l(inval, length)
-			elif self.list_bintype == 'int_u16_l': writer.list_int_u16_l(inval, length)
-			elif self.list_bintype == 'int_s32_l': writer.list_int_s32_l(inval, length)
-			elif self.list_bintype == 'int_u32_l': writer.list_int_u32_l(inval, length)
-			elif self.list_bintype == 'int_s64_l': writer.list_int_s64_l(inval, length)
-			elif self.list_bintype == 'int_u64_l': writer.list_int_u64_l(inval, length)
-			elif self.list_bintype == 'float_l': writer.list_float_l(inval, length)
-			elif self.list_bintype == 'double_l': writer.list_double_l(inval, length)
-			elif self.list_bintype == 'dict': 
-				for x in inval:
-					self.parts.write(state, x)
-			elif self.list_bintype == 'struct':
-				if self.struct_name in state.structs:
-					structdata = state.structs[self.struct_name]
-					for x in inval:
-						structdata.write(state, x)
-				else:
-					print('write: struct not found', self.struct_name)
-				#exit()
+			count = self.dump_count(inval)
+			return count, self.part_size.dump_scalar(state, count, buf, off)
+		elif self.size_source == 'lenval': return self.dump_count(inval), off
+		elif self.size_source == 'fromkey': return indict[self.size_local_name], off
+		raise ValueError('dump: unsupported length source %s' % self.size_source)
 
-			else: 
-				print('write: unsupported list_bintype', self.list_bintype)
-				exit()
-
-	def write(self, state, indict, num):
-		name = self.name if self.name else 'unk_%i'%num
-		inval = indict[name]
-		writer = state.writer
-
-		if self.bintype == 'int_s8': writer.int_s8(inval)
-		elif self.bintype == 'int_u8': writer.int_u8(inval)
-		elif self.bintype == 'int_s16': writer.int_s16(inval)
-		elif self.bintype == 'int_u16': writer.int_u16(inval)
-		elif self.bintype == 'int_s32': writer.int_s32(inval)
-		elif self.bintype == 'int_u32': writer.int_u32(inval)
-		elif self.bintype == 'int_s64': writer.int_s64(inval)
-		elif self.bintype == 'int_u64': writer.int_u64(inval)
-		elif self.bintype == 'float': writer.float(inval)
-		elif self.bintype == 'double': writer.double(inval)
-
-		elif self.bintype == 'int_s16_b': writer.int_s16_b(inval)
-		elif self.bintype == 'int_u16_b': writer.int_u16_b(inval)
-		elif self.bintype == 'int_s32_b': writer.int_s32_b(inval)
-		elif self.bintype == 'int_u32_b': writer.int_u32_b(inval)
-		elif self.bintype == 'int_s64_b': writer.int_s64_b(inval)
-		elif self.bintype == 'int_u64_b': writer.int_u64_b(inval)
-		elif self.bintype == 'float_b': writer.float_b(inval)
-		elif self.bintype == 'double_b': writer.double_b(inval)
-
-		elif self.bintype == 'int_s16_l': writer.int_s16_l(inval)
-		elif self.bintype == 'int_u16_l': writer.int_u16_l(inval)
-		elif self.bintype == 'int_s32_l': writer.int_s32_l(inval)
-		elif self.bintype == 'int_u32_l': writer.int_u32_l(inval)
-		elif self.bintype == 'int_s64_l': writer.int_s64_l(inval)
-		elif self.bintype == 'int_u64_l': writer.int_u64_l(inval)
-		elif self.bintype == 'float_l': writer.float_l(inval)
-		elif self.bintype == 'double_l': writer.double_l(inval)
-
-		elif self.bintype == 'string_t': writer.string_t(inval)
-		
-		elif self.bintype == 'struct': 
-			if self.struct_name in state.structs:
-				structdata = state.structs[self.struct_name]
-				for x in inval:
-					structdata.write(state, x)
-			else:
-				print('write: struct not found', self.struct_name)
-			#exit()
-
-		elif self.bintype == 'raw':
-			length = self.write_len(state, indict, len(inval))
-			writer.raw_n(inval, length)
-		elif self.bintype == 'string':
-			length = self.write_len(state, indict, len(inval))
-			writer.string(inval, length)
-		elif self.bintype == 'string16':
-			length = self.write_len(state, indict, len(inval))
-			writer.string16(inval, length)
-		elif self.bintype == 'list':
-			length = self.write_len(state, indict, len(inval))
-			self.write_list(state, inval, length)
+	def dump_list(self, state, inval, length, buf, off):
+		import numpy as np
+		if self.list_bintype in list_bintypes:
+			if length < 1: return off
+			dtype = state.get_dtype(self.list_bintype)
+			if buf is not None: 
+				outarr = np.frombuffer(buf, dtype, length, off)
+				numval = min(length, len(inval))
+				outarr[:numval] = inval[:numval]
+				outarr[numval:] = 0
+			return off+(length*dtype.itemsize)
+		if length < -1: return off
+		if isinstance(inval, np.ndarray) and inval.dtype.names: return state.dump_raw(inval.tobytes(), buf, off)
+		if self.list_bintype == 'dict':
+			for x in inval: off = self.parts.dump(state, x, buf, off)[0]
+			return off
+		if self.list_bintype == 'struct':
+			for x in inval: off = state.dump_struct(self.struct_name, x, buf, off)
+			return off
+		raise ValueError('dump: unsupported list_bintype %s' % self.list_bintype)
 
-		else: 
-			print('unsupported bintype', self.bintype)
-			exit()
+	def dump(self, state, indict, num, buf, off):
+		inval = indict[self.name if self.name else 'unk_%i'%num]
+		bintype = self.bintype
+		if state.get_struct(bintype) is not None: return self.dump_scalar(state, inval, buf, off)
+		elif bintype == 'string_t': return state.dump_raw(str(inval).encode()+b'\0', buf, off)
+		elif bintype == 'struct': return state.dump_struct(self.struct_name, inval, buf, off)
+		elif bintype == 'skip':
+			if self.size_source != 'manual': raise ValueError('dump: skip needs a manual size')
+			return state.dump_raw(bytes(self.size_manual), buf, off)
+		elif bintype in ['raw', 'string', 'string16']:
+			length, off = self.dump_len(state, indict, inval, buf, off)
+			if bintype == 'string16': length *= 2
+			if buf is None and length > -1: return off+length
+			if bintype == 'raw': data = bytes(inval)
+			elif bintype == 'string': data = str(inval).encode()
+			else: data = str(inval).encode('utf-16-le')
+			if length > -1: data = data[:length]+bytes(max(0, length-len(data)))
+			return state.dump_raw(data, buf, off)
+		elif bintype == 'list':
+			length, off = self.dump_len(state, indict, inval, buf, off)
+			return self.dump_list(state, inval, length, buf, off)
+		raise ValueError('dump: unsupported bintype %s' % bintype)
 
 class datadef_break:
 	def __init__(self):
@@ -390,74 +405,1091 @@ class datadef_parse_state_reader:
 		self.lengths = {}
 		self.reader = easybinrw.binread()
 		self.tabnum = 0
+		self.compiled = None
+		self.layouts = None
+		self.profiler = None
 
 	def parse_struct(self, structname, outval):
-		if structname in self.structs:
-			return self.structs[structname].parse(self, outval)
-
-class datadef_parse_state_writer:
-	def __init__(self):
-		self.structs = {}
-		self.lengths = {}
-		self.writer = easybinrw.binwrite()
-		self.tabnum = 0
-
-	def write_struct(self, structname, outval):
+		if self.compiled is not None and structname in self.compiled:
+			return self.compiled[structname](self, outval)
 		if structname in self.structs:
 			return self.structs[structname].parse(self, outval)
 
 class datadef_partlist:
 	def __init__(self):
 		self.parts = []
+		self.dispatch = []
 
 	def parse(self, state, outval, **args):
-		for num, part in enumerate(self.parts):
+		if state.profiler is not None: return state.profiler.parse_partlist(self, state, outval)
+		for num, part in self.dispatch:
 			if isinstance(part, datadef_part): part.parse(state, outval, num)
-			if isinstance(part, datadef_match): 
+			elif isinstance(part, (datadef_jump, datadef_match)): 
 				oc = part.parse(state, outval)
 				if oc: return oc
+			elif isinstance(part, datadef_break): 
+				return 'BREAK'
+
+	def iter_path(self, state, outval, path):
+		for num, part in enumerate(self.parts):
+			if isinstance(part, datadef_part) and part.type == 'part' and (part.name if part.name else 'unk_%i'%num) == path[0]:
+				if len(path) == 1 and part.bintype == 'list':
+					yield from part.iter_value_list(state, outval)
+					return 'FOUND'
+				if len(path) > 1 and part.bintype == 'struct' and part.struct_name in state.structs:
+					outval[path[0]] = {}
+					return (yield from state.structs[part.struct_name].parts.iter_path(state, outval[path[0]], path[1:]))
+			if isinstance(part, datadef_part): part.parse(state, outval, num)
+			if isinstance(part, datadef_match): 
+				if part.match(outval[part.name]):
+					oc = yield from part.parts.iter_path(state, outval, path)
+					if oc: return oc
 			if isinstance(part, datadef_break): 
 				return 'BREAK'
 
+	def dump(self, state, indict, buf, off):
+		for num, part in enumerate(self.parts):
+			if isinstance(part, datadef_part):
+				if part.type == 'part': off = part.dump(state, indict, num, buf, off)
+				elif part.type == 'length':
+					count = self.find_length_count(part.name, indict)
+					state.lengths[part.name] = count
+					off = part.dump_scalar(state, count, buf, off)
+			if isinstance(part, datadef_match): 
+				if part.name in indict and part.match(indict[part.name]):
+					off, oc = part.parts.dump(state, indict, buf, off)
+					if oc: return off, oc
+			if isinstance(part, datadef_break): 
+				return off, 'BREAK'
+		return off, None
+
+	def find_length_count(self, name, indict):
+		for num, part in enumerate(self.parts):
+			if isinstance(part, datadef_part) and part.type == 'part' and part.size_source == 'lenval' and part.size_name == name:
+				key = part.name if part.name else 'unk_%i'%num
+				if key in indict: return part.dump_count(indict[key])
+			if isinstance(part, datadef_match):
+				count = part.parts.find_length_count(name, indict)
+				if count is not None: return count
+		if name in indict: return indict[name]
+
 	def read_parts(self, x):
 		part_obj = xmltags[x.tag]()
 		part_obj.read(x)
+		num = len(self.parts)
 		self.parts.append(part_obj)
+		if isinstance(part_obj, datadef_match) and part_obj.is_jumpable():
+			last = self.dispatch[-1][1] if self.dispatch else None
+			if isinstance(last, datadef_jump) and last.add(part_obj): return
+			self.dispatch.append((num, datadef_jump(part_obj)))
+		else: self.dispatch.append((num, part_obj))
 
-	def write(self, state, indict):
-		for num, part in enumerate(self.parts):
-			if part.type=='part': part.write(state, indict, num)
-			elif part.type=='length': 
-				print('write: storing length part not supported')
-				exit()
+	def writes_key(self, name):
+		for part in self.parts:
+			if isinstance(part, datadef_part) and part.type == 'part' and part.name == name: return True
+			if isinstance(part, datadef_match) and part.parts.writes_key(name): return True
+		return False
 
 class datadef_struct:
 	def __init__(self):
+		self.name = None
 		self.parts = datadef_partlist()
 
 	def read(self, xml_obj):
+		self.name = xml_obj.get('name')
 		for x in xml_obj:
 			self.parts.read_parts(x)
 
 	def parse(self, state, outval):
+		if state.profiler is not None: return state.profiler.parse_struct(self, state, outval)
 		state.tabnum += 1
 		o = self.parts.parse(state, outval, debugsource='struct')
 		state.tabnum -= 1
 		return o
 
-	def write(self, state, indict):
-		self.parts.write(state, indict)
+
+class datadef_profiler:
+	def __init__(self):
+		self.structs = {}
+		self.parts = {}
+		self.stack = []
+		self.partstack = []
+		self.totaltime = 0.0
+
+	def clear(self):
+		self.__init__()
+
+	def add(self, table, key, size, elapsed, recursive):
+		stats = table.get(key)
+		if stats is None: stats = table[key] = [0, 0, 0.0]
+		stats[0] += 1
+		if not recursive:
+			stats[1] += size
+			stats[2] += elapsed
+
+	def parse_struct(self, struct_obj, state, outval):
+		name = struct_obj.name
+		recursive = name in self.stack
+		self.stack.append(name)
+		start = state.reader.tell_real()
+		starttime = perf_counter()
+		try: o = self.parse_partlist(struct_obj.parts, state, outval)
+		finally: self.stack.pop()
+		elapsed = perf_counter()-starttime
+		self.add(self.structs, name, state.reader.tell_real()-start, elapsed, recursive)
+		if not self.stack: self.totaltime += elapsed
+		return o
+
+	def parse_partlist(self, partlist, state, outval):
+		structname = self.stack[-1] if self.stack else None
+		reader = state.reader
+		for num, part in partlist.dispatch:
+			if isinstance(part, datadef_part): 
+				key = (structname, part.name if part.name else 'unk_%i'%num)
+				recursive = key in self.partstack
+				self.partstack.append(key)
+				start = reader.tell_real()
+				starttime = perf_counter()
+				try: part.parse(state, outval, num)
+				finally: self.partstack.pop()
+				self.add(self.parts, key, reader.tell_real()-start, perf_counter()-starttime, recursive)
+			if isinstance(part, (datadef_jump, datadef_match)): 
+				oc = part.parse(state, outval)
+				if oc: return oc
+			if isinstance(part, datadef_break): 
+				return 'BREAK'
+
+	def to_dict(self):
+		out = {'structs': {}, 'parts': {}}
+		for name, stats in self.structs.items(): 
+			out['structs'][name] = {'calls': stats[0], 'bytes': stats[1], 'cumtime': stats[2]}
+		for (structname, name), stats in self.parts.items(): 
+			if structname not in out['parts']: out['parts'][structname] = {}
+			out['parts'][structname][name] = {'calls': stats[0], 'bytes': stats[1], 'cumtime': stats[2]}
+		return out
+
+	def report(self, sort='cumtime', limit=None):
+		sortnum = {'calls': 0, 'bytes': 1, 'cumtime': 2}[sort]
+		rows = [(stats, str(name)) for name, stats in self.structs.items()]
+		rows += [(stats, '%s:%s' % name) for name, stats in self.parts.items()]
+		rows.sort(key=lambda x: x[0][sortnum], reverse=True)
+		if limit is not None: rows = rows[:limit]
+		lines = ['%i struct calls, %i part calls in %.6f seconds' % (sum(x[0] for x in self.structs.values()), sum(x[0] for x in self.parts.values()), self.totaltime), '']
+		lines.append('%10s %12s %12s %12s  %s' % ('ncalls', 'bytes', 'cumtime', 'percall', 'struct:part'))
+		for stats, name in rows: 
+			lines.append('%10i %12i %12.6f %12.6f  %s' % (stats[0], stats[1], stats[2], stats[2]/stats[0] if stats[0] else 0, name))
+		return '\n'.join(lines)
+
+	def print_stats(self, sort='cumtime', limit=None):
+		print(self.report(sort, limit))
+
+class datadef_dump_state:
+	def __init__(self, structs, endian):
+		self.structs = structs
+		self.endian = endian
+		self.lengths = {}
+		self.layouts = datadef_layouts(structs, endian)
+		self.packers = {}
+		self.dtypes = {}
+
+	def get_struct(self, bintype):
+		if bintype not in self.packers:
+			fmt = scalar_format(bintype, self.endian) if bintype else None
+			self.packers[bintype] = Struct(fmt) if fmt else None
+		return self.packers[bintype]
+
+	def get_dtype(self, bintype):
+		if bintype not in self.dtypes: 
+			import numpy as np
+			self.dtypes[bintype] = np.dtype(scalar_format(bintype, self.endian))
+		return self.dtypes[bintype]
+
+	def dump_raw(self, data, buf, off):
+		if buf is not None: buf[off:off+len(data)] = data
+		return off+len(data)
+
+	def dump_struct(self, structname, indict, buf, off):
+		if structname not in self.structs: raise ValueError('dump: struct not found %s' % structname)
+		layout = self.layouts.struct(structname)
+		if layout is None: return self.structs[structname].parts.dump(self, indict, buf, off)[0]
+		if buf is not None: 
+			fmt = layout.get_format()
+			if fmt not in self.packers: self.packers[fmt] = Struct(fmt)
+			self.packers[fmt].pack_into(buf, off, *layout.get_values(indict, []))
+		return off+layout.size
+
+class datadef_layout:
+	def __init__(self):
+		self.fields = []
+		self.order = None
+		self.fmt = ''
+		self.size = 0
+
+	def add(self, other):
+		if other.order and self.order and other.order != self.order: return False
+		self.order = self.order or other.order
+		self.fields += other.fields
+		self.fmt += other.fmt
+		self.size += other.size
+		return True
+
+	def get_format(self): return (self.order or '<')+self.fmt
+
+	def get_values(self, indict, out):
+		import numpy as np
+		for key, kind, size, extra in self.fields:
+			v = indict[key]
+			if kind == 'scalar': out.append(v)
+			elif kind == 'raw': out.append(bytes(v))
+			elif kind == 'string': out.append(str(v).encode())
+			elif kind == 'list':
+				outarr = np.zeros(extra[1], extra[0])
+				numval = min(extra[1], len(v))
+				outarr[:numval] = v[:numval]
+				out.append(outarr.tobytes())
+			elif kind == 'struct': extra.get_values(v, out)
+		return out
+
+	def get_dtype_spec(self):
+		dtfields = []
+		for key, kind, size, extra in self.fields:
+			if kind == 'scalar': dtfields.append((key, (self.order or '<')+extra))
+			elif kind == 'raw': dtfields.append((key, 'V%i' % size))
+			elif kind == 'string': dtfields.append((key, 'S%i' % size))
+			elif kind == 'list': dtfields.append((key, extra[0], (extra[1],)))
+			elif kind == 'struct': 
+				subdtype = extra.get_dtype_spec()
+				if subdtype is None: return None
+				dtfields.append((key, subdtype))
+		if len(set([x[0] for x in dtfields])) != len(dtfields): return None
+		return dtfields
+
+class datadef_layouts:
+	def __init__(self, structs, endian):
+		self.structs = structs
+		self.endian = endian
+		self.cache = {}
+		self.partcache = {}
+		self.listcache = {}
+		self.refcache = {}
+		self.tailcache = {}
+		self.skip_funcs = None
+
+	def part(self, part, num):
+		if not isinstance(part, datadef_part) or part.type != 'part': return None
+		key = part.name if part.name else 'unk_%i'%num
+		out = datadef_layout()
+		fmt = scalar_format(part.bintype, self.endian) if part.bintype else None
+		fixedsize = part.size_source == 'manual' and part.size_manual >= 0
+		if fmt:
+			out.order = fmt[0] if fmt[0] in '<>' else None
+			out.fmt = fmt.lstrip('<>')
+			out.size = Struct(fmt).size
+			out.fields.append((key, 'scalar', out.size, out.fmt))
+		elif part.bintype in ['raw', 'string'] and fixedsize:
+			out.fmt = '%is' % part.size_manual
+			out.size = part.size_manual
+			out.fields.append((key, part.bintype, out.size, None))
+		elif part.bintype == 'list' and part.list_bintype in list_bintypes and fixedsize:
+			listfmt = scalar_format(part.list_bintype, self.endian)
+			out.size = Struct(listfmt).size*part.size_manual
+			out.fmt = '%is' % out.size
+			out.fields.append((key, 'list', out.size, (listfmt, part.size_manual)))
+		elif part.bintype == 'struct':
+			sublayout = self.struct(part.struct_name)
+			if sublayout is None: return None
+			out.order = sublayout.order
+			out.fmt = sublayout.fmt
+			out.size = sublayout.size
+			out.fields.append((key, 'struct', out.size, sublayout))
+		else: return None
+		return out
+
+	def partlist(self, partlist):
+		out = datadef_layout()
+		for num, part in enumerate(partlist.parts):
+			if isinstance(part, datadef_part) and part.type == 'size': continue
+			partlayout = self.part(part, num)
+			if partlayout is None or not out.add(partlayout): return None
+		return out
+
+	def struct(self, name):
+		if name not in self.structs: return None
+		if name not in self.cache:
+			self.cache[name] = None
+			self.cache[name] = self.partlist(self.structs[name].parts)
+		return self.cache[name]
+
+	def cached_part(self, part, num):
+		key = id(part)
+		if key not in self.partcache: self.partcache[key] = self.part(part, num)
+		return self.partcache[key]
+
+	def cached_partlist(self, partlist):
+		key = id(partlist)
+		if key not in self.listcache:
+			self.listcache[key] = None
+			self.listcache[key] = self.partlist(partlist)
+		return self.listcache[key]
+
+	def refs(self, partlist):
+		key = id(partlist)
+		if key not in self.refcache:
+			out = set()
+			for part in partlist.parts:
+				if isinstance(part, datadef_match): out |= set([part.name])|self.refs(part.parts)
+				elif isinstance(part, datadef_part) and part.size_source == 'fromkey': out.add(part.size_local_name)
+			self.refcache[key] = out
+		return self.refcache[key]
+
+	def reads_after(self, partlist):
+		key = id(partlist)
+		if key not in self.tailcache:
+			out = []
+			found = False
+			for part in reversed(partlist.parts):
+				out.append(found)
+				if isinstance(part, datadef_match) or (isinstance(part, datadef_part) and part.type in ['part', 'length']): found = True
+			self.tailcache[key] = out[::-1]
+		return self.tailcache[key]
+
+	def skip_partlist(self, state, partlist, outval):
+		refs = self.refs(partlist)
+		for num, part in enumerate(partlist.parts):
+			if isinstance(part, datadef_part):
+				if part.type == 'length': part.parse(state, outval, num)
+				elif part.type == 'part':
+					name = part.name if part.name else 'unk_%i'%num
+					if name in refs: outval[name] = part.read_value(state, outval)
+					else: self.skip_part(state, part, num, outval)
+			if isinstance(part, datadef_match):
+				if part.match(outval[part.name]):
+					exitval = self.skip_partlist(state, part.parts, outval)
+					if exitval: return exitval
+			if isinstance(part, datadef_break): 
+				return 'BREAK'
+
+	def skip_part(self, state, part, num, outval):
+		reader = state.reader
+		layout = self.cached_part(part, num)
+		if layout is not None: reader.skip(layout.size)
+		elif part.bintype in ['raw', 'string', 'skip']: reader.skip(part.read_lenval(state, outval))
+		elif part.bintype == 'struct':
+			if part.struct_name in self.structs: self.skip_partlist(state, self.structs[part.struct_name].parts, {})
+		elif part.bintype == 'list' and part.list_bintype in list_bintypes:
+			size = part.read_lenval(state, outval)
+			if size > 0: reader.skip(size*Struct(scalar_format(part.list_bintype, self.endian)).size)
+		elif part.bintype == 'list' and part.list_bintype == 'dict':
+			self.skip_list(state, part.parts, part.read_lenval(state, outval))
+		elif part.bintype == 'list' and part.list_bintype == 'struct' and part.struct_name in self.structs:
+			self.skip_list(state, self.structs[part.struct_name].parts, part.read_lenval(state, outval))
+		else: part.read_value(state, outval)
+
+	def skipper(self, partlist):
+		if self.skip_funcs is None: return None
+		key = id(partlist)
+		if key not in self.skip_funcs: self.skip_funcs[key] = datadef_compiler(self.structs, self.endian).compile_skipper(partlist)
+		return self.skip_funcs[key]
+
+	def skip_list(self, state, partlist, size, offsets=None, lengths=None):
+		reader = state.reader
+		layout = self.cached_partlist(partlist)
+		if size > -1 and layout is not None and offsets is None: 
+			reader.skip(size*layout.size)
+			return
+		skip = self.skipper(partlist)
+		num = 0
+		while size == -1 or num < size:
+			if offsets is not None: offsets.append(reader.tell_real())
+			if lengths is not None: lengths.append(dict(state.lengths))
+			exitval = skip(state, {}) if skip is not None else self.skip_partlist(state, partlist, {})
+			num += 1
+			if size == -1 and exitval == 'BREAK': break
+
+	def uses_lengths(self, partlist, seen=()):
+		for part in partlist.parts:
+			if isinstance(part, datadef_part):
+				if part.type == 'length' or part.size_source == 'lenval': return True
+				if part.bintype in ['struct', 'list'] and part.struct_name in self.structs and part.struct_name not in seen:
+					if self.uses_lengths(self.structs[part.struct_name].parts, seen+(part.struct_name,)): return True
+			if isinstance(part, (datadef_part, datadef_match)) and self.uses_lengths(part.parts, seen): return True
+		return False
+
+class datadef_lazy_record(Mapping):
+	__slots__ = ['state', 'partlist', 'offset', 'end', 'lengths', 'values', 'exitval', 'need_end']
+
+	def __init__(self, state, partlist, offset, lengths, need_end=False):
+		self.state = state
+		self.partlist = partlist
+		self.offset = offset
+		self.end = None
+		self.lengths = lengths
+		self.values = None
+		self.exitval = None
+		self.need_end = need_end
+
+	def __getitem__(self, k): 
+		self.internal_decode()
+		return self.values[k]
+
+	def __iter__(self): 
+		self.internal_decode()
+		return iter(self.values)
+
+	def __len__(self): 
+		self.internal_decode()
+		return len(self.values)
+
+	def __repr__(self):
+		return '<datadef_lazy_record offset=%i%s>' % (self.offset, '' if self.values is None else ' decoded')
+
+	def to_dict(self): return {k: lazy_to_value(v) for k, v in self.items()}
+
+	def internal_decode(self):
+		if self.values is not None: return
+		state = self.state
+		if self.lengths is not None: state.lengths = dict(self.lengths)
+		state.reader.seek_real(self.offset)
+		self.values = {}
+		self.exitval = self.internal_walk(self.partlist, self.values, self.need_end)
+		if self.need_end: self.end = state.reader.tell_real()
+
+	def internal_walk(self, partlist, outval, need_end):
+		state = self.state
+		reads_after = state.layouts.reads_after(partlist)
+		for num, part in enumerate(partlist.parts):
+			if isinstance(part, datadef_part):
+				if part.type == 'part':
+					name = part.name if part.name else 'unk_%i'%num
+					if part.bintype == 'struct': outval[name] = self.internal_struct(part.struct_name, need_end or reads_after[num])
+					elif part.bintype == 'list' and part.list_bintype in ['dict', 'struct']: outval[name] = self.internal_list(part, outval, need_end or reads_after[num])
+					else: outval[name] = part.read_value(state, outval)
+				elif part.type == 'length': part.parse(state, outval, num)
+			if isinstance(part, datadef_match):
+				if part.match(outval[part.name]):
+					oc = self.internal_walk(part.parts, outval, need_end or reads_after[num])
+					if oc: return oc
+			if isinstance(part, datadef_break): 
+				return 'BREAK'
+
+	def internal_struct(self, structname, need_end):
+		state = self.state
+		if structname not in state.structs: return {}
+		reader = state.reader
+		partlist = state.structs[structname].parts
+		layout = state.layouts.struct(structname)
+		if layout is not None: 
+			record = datadef_lazy_record(state, partlist, reader.tell_real(), None)
+			record.end = record.offset+layout.size
+			reader.seek_real(record.end)
+		elif need_end: 
+			record = datadef_lazy_record(state, partlist, reader.tell_real(), None, True)
+			record.internal_decode()
+		else: record = datadef_lazy_record(state, partlist, reader.tell_real(), dict(state.lengths))
+		return record
+
+	def internal_list(self, part, outval, need_end):
+		state = self.state
+		reader = state.reader
+		size = part.read_lenval(state, outval)
+		if part.list_bintype == 'dict': 
+			partlist = part.parts
+			layout = state.layouts.partlist(partlist)
+		elif part.struct_name in state.structs: 
+			partlist = state.structs[part.struct_name].parts
+			layout = state.layouts.struct(part.struct_name)
+		else: return part.read_value_list(state, outval)
+
+		if size > -1 and layout is not None:
+			lazylist = datadef_lazy_list(state, partlist, range(reader.tell_real(), reader.tell_real()+(size*layout.size), layout.size), None)
+			reader.skip(size*layout.size)
+			return lazylist
+
+		if size >= -1:
+			startlengths = dict(state.lengths) if state.layouts.uses_lengths(partlist) else None
+			lazylist = datadef_lazy_list(state, partlist, None, None, reader.tell_real(), size, startlengths)
+			if need_end: lazylist.internal_index()
+			return lazylist
+
+class datadef_lazy_list(Sequence):
+	__slots__ = ['state', 'partlist', 'offsets', 'lengths', 'records', 'start', 'size', 'startlengths']
+
+	def __init__(self, state, partlist, offsets, lengths, start=None, size=None, startlengths=None):
+		self.state = state
+		self.partlist = partlist
+		self.offsets = offsets
+		self.lengths = lengths
+		self.records = {}
+		self.start = start
+		self.size = size
+		self.startlengths = startlengths
+
+	def __len__(self): 
+		self.internal_index()
+		return len(self.offsets)
+
+	def __getitem__(self, num):
+		self.internal_index()
+		if isinstance(num, slice): return [self[x] for x in range(*num.indices(len(self)))]
+		if num < 0: num += len(self)
+		if num not in self.records:
+			self.records[num] = datadef_lazy_record(self.state, self.partlist, self.offsets[num], self.lengths[num] if self.lengths is not None else {})
+		return self.records[num]
+
+	def __repr__(self): 
+		if self.offsets is None: return '<datadef_lazy_list offset=%i>' % self.start
+		return '<datadef_lazy_list len=%i>' % len(self)
+
+	def internal_index(self):
+		if self.offsets is not None: return
+		state = self.state
+		if self.startlengths is not None: state.lengths = dict(self.startlengths)
+		state.reader.seek_real(self.start)
+		offsets = array('q')
+		lengths = [] if self.startlengths is not None else None
+		state.layouts.skip_list(state, self.partlist, self.size, offsets, lengths)
+		self.offsets = offsets
+		self.lengths = lengths
+
+	def to_list(self): return [x.to_dict() for x in self]
+
+def lazy_to_value(v):
+	if isinstance(v, datadef_lazy_record): return v.to_dict()
+	if isinstance(v, datadef_lazy_list): return v.to_list()
+	return v
+
+def to_columns(values):
+	import numpy as np
+	if isinstance(values, np.ndarray):
+		if values.dtype.names: return dict([(name, to_columns(values[name])) for name in values.dtype.names])
+		return values
+	if values and all(isinstance(x, dict) for x in values):
+		keys = {}
+		for x in values: keys.update(dict.fromkeys(x))
+		return dict([(key, to_columns([x.get(key) for x in values])) for key in keys])
+	if values and all(isinstance(x, (list, np.ndarray)) for x in values):
+		offsets = np.zeros(len(values)+1, np.int64)
+		np.cumsum([len(x) for x in values], out=offsets[1:])
+		if all(isinstance(x, np.ndarray) for x in values): flat = np.concatenate(values)
+		else: flat = [v for x in values for v in x]
+		return {'offsets': offsets, 'values': to_columns(flat)}
+	if values and all(isinstance(x, (int, float, str, np.generic)) for x in values): return np.array(values)
+	out = np.empty(len(values), object)
+	out[:] = values
+	return out
+
+def columnar_value(v):
+	import numpy as np
+	if isinstance(v, dict): return dict([(key, columnar_value(x)) for key, x in v.items()])
+	if isinstance(v, np.ndarray) and v.dtype.names: return to_columns(v)
+	if isinstance(v, list) and v and all(isinstance(x, dict) for x in v): return to_columns(v)
+	return v
+
+class datadef_lazy_numpy:
+	def __init__(self, namespace, dtypes):
+		self.namespace = namespace
+		self.dtypes = dtypes
+
+	def __getattr__(self, name):
+		import numpy as np
+		self.namespace['np'] = np
+		for dtname, value in self.dtypes.items(): self.namespace[dtname] = np.dtype(value)
+		return getattr(np, name)
+
+class datadef_compiled:
+	def __init__(self):
+		self.parsers = {}
+		self.source = ''
+		self.code = None
+		self.recipe = {}
+		self.struct_funcs = {}
+
+	def link(self):
+		namespace = {}
+		dtypes = {}
+		namespace['np'] = datadef_lazy_numpy(namespace, dtypes)
+		for name, (kind, value) in self.recipe.items():
+			if kind == 'unpack': namespace[name] = Struct(value).unpack
+			elif kind == 'unpack_from': namespace[name] = Struct(value).unpack_from
+			elif kind == 'dtype': dtypes[name] = value
+			else: namespace[name] = value
+		exec(self.code, namespace)
+		for name, funcname in self.struct_funcs.items():
+			self.parsers[name] = namespace[funcname]
+
+	def __getstate__(self):
+		return {'source': self.source, 'code': marshal.dumps(self.code), 'recipe': self.recipe, 'struct_funcs': self.struct_funcs}
+
+	def __setstate__(self, state):
+		self.__init__()
+		self.source = state['source']
+		self.code = marshal.loads(state['code'])
+		self.recipe = state['recipe']
+		self.struct_funcs = state['struct_funcs']
+		self.link()
+
+class datadef_compiler:
+	def __init__(self, structs, endian, struct_arrays=False):
+		self.structs = structs
+		self.endian = endian
+		self.struct_arrays = struct_arrays
+		self.layouts = datadef_layouts(structs, endian)
+		self.lines = []
+		self.funcs = []
+		self.recipe = {}
+		self.constnames = {}
+		self.funcnum = 0
+		self.varnum = 0
+		self.struct_funcs = {}
+		self.projected = {}
+
+	def const(self, obj, prefix, kind='obj'):
+		if id(obj) not in self.constnames:
+			name = '%s_%i' % (prefix, len(self.constnames))
+			self.constnames[id(obj)] = name
+			self.recipe[name] = [kind, obj]
+		return self.constnames[id(obj)]
+
+	def cached_const(self, key, prefix):
+		if (prefix, key) not in self.constnames:
+			name = '%s_%i' % (prefix, len(self.constnames))
+			self.constnames[(prefix, key)] = name
+			self.recipe[name] = [prefix, key]
+		return self.constnames[(prefix, key)]
+
+	def unpacker(self, fmt): return self.cached_const(fmt, 'unpack')
+
+	def unpacker_from(self, fmt): return self.cached_const(fmt, 'unpack_from')
+
+
+	def dtype(self, dtype): return self.cached_const(dtype, 'dtype')
+
+	def var(self, prefix):
+		self.varnum += 1
+		return '%s%i' % (prefix, self.varnum)
+
+	def emit(self, indent, text): self.lines.append('\t'*indent+text)
+
+	def compile(self, structname=None, fields=None):
+		for name in self.structs: 
+			self.funcnum += 1
+			self.struct_funcs[name] = 'parse_%i' % self.funcnum
+		for name, struct_obj in self.structs.items():
+			self.emit_parse_func(self.struct_funcs[name], struct_obj.parts)
+		if fields is not None and structname in self.structs:
+			self.struct_funcs[structname] = self.project_func(self.structs[structname].parts, fields)
+		return self.internal_build()
+
+	def compile_skipper(self, partlist):
+		funcname = self.project_func(partlist, {})
+		self.struct_funcs = {funcname: funcname}
+		return self.internal_build().parsers[funcname]
+
+	def internal_build(self):
+		out = datadef_compiled()
+		out.source = '\n'.join(self.funcs)
+		out.code = compile(out.source, '<datadef>', 'exec')
+		out.recipe = self.recipe
+		out.struct_funcs = self.struct_funcs
+		out.link()
+		return out
+
+	def emit_func(self, header, emit_body):
+		oldlines = self.lines
+		self.lines = []
+		for x in header: self.emit(0 if x.startswith('def ') else 1, x)
+		startlen = len(self.lines)
+		emit_body()
+		if len(self.lines) == startlen: self.emit(1, 'pass')
+		self.funcs.append('\n'.join(self.lines)+'\n')
+		self.lines = oldlines
+
+	def emit_parse_func(self, funcname, partlist):
+		header = ['def %s(state, outval):' % funcname, 'reader = state.reader', 'read = reader.str.read']
+		self.emit_func(header, lambda: self.emit_parse_partlist(1, partlist))
+
+	def project_func(self, partlist, fields):
+		key = (id(partlist), fields_key(fields))
+		if key not in self.projected:
+			self.funcnum += 1
+			funcname = self.projected[key] = 'project_%i' % self.funcnum
+			header = ['def %s(state, outval):' % funcname, 'reader = state.reader', 'read = reader.str.read']
+			self.emit_func(header, lambda: self.emit_project_partlist(1, partlist, fields, self.project_keep(partlist)))
+		return self.projected[key]
+
+	def project_keep(self, partlist, out=None):
+		if out is None: out = set()
+		for part in partlist.parts:
+			if isinstance(part, datadef_part) and part.size_source == 'fromkey': out.add(part.size_local_name)
+			if isinstance(part, datadef_match): 
+				out.add(part.name)
+				self.project_keep(part.parts, out)
+		return out
+
+	def emit_project_partlist(self, indent, partlist, fields, keep):
+		run = []
+		for num, part in enumerate(partlist.parts):
+			if isinstance(part, datadef_part) and part.type == 'part':
+				key = part.name if part.name else 'unk_%i'%num
+				wanted = key in fields or key in keep
+				partlayout = self.layouts.part(part, num)
+				if partlayout is not None:
+					run.append([partlayout, {key: fields.get(key)} if wanted else {}])
+					continue
+				self.emit_project_run(indent, run)
+				run = []
+				if wanted: self.emit_project_part(indent, part, num, fields.get(key))
+				else: self.emit_skip_part(indent, part)
+				continue
+			self.emit_project_run(indent, run)
+			run = []
+			if isinstance(part, datadef_part) and part.type == 'length':
+				if part.name: self.emit(indent, 'state.lengths[%r] = %s' % (part.name, self.expr_size(part)))
+				else: self.emit(indent, "print('length must have a name')")
+			if isinstance(part, datadef_match): 
+				cond = self.expr_match(part)
+				if cond is None: self.emit(indent, 'outval[%r]' % part.name)
+				else:
+					self.emit(indent, 'if %s:' % cond)
+					startlen = len(self.lines)
+					self.emit_project_partlist(indent+1, part.parts, fields, keep)
+					if len(self.lines) == startlen: self.emit(indent+1, 'pass')
+			if isinstance(part, datadef_break): 
+				self.emit(indent, "return 'BREAK'")
+				return
+		self.emit_project_run(indent, run)
+
+	def emit_project_run(self, indent, run):
+		size = sum([x[0].size for x in run])
+		if not size: return
+		if not [x for x in run if x[1]]: 
+			self.emit(indent, 'reader.skip(%i)' % size)
+			return
+		bufvar = self.var('b')
+		self.emit(indent, '%s = read(%i)' % (bufvar, size))
+		offset = 0
+		for partlayout, fields in run:
+			self.emit_layout_fields(indent, 'outval', partlayout, fields, bufvar, offset)
+			offset += partlayout.size
+
+	def emit_layout_fields(self, indent, target, layout, fields, bufvar, offset):
+		for key, kind, size, extra in layout.fields:
+			if fields is not None and key not in fields: 
+				offset += size
+				continue
+			if kind == 'struct':
+				valvar = self.var('v')
+				self.emit(indent, '%s = {}' % valvar)
+				self.emit_layout_fields(indent, valvar, extra, fields[key] if fields is not None else None, bufvar, offset)
+				self.emit(indent, '%s[%r] = %s' % (target, key, valvar))
+			else:
+				if kind == 'scalar': value = '%s(%s, %i)[0]' % (self.unpacker_from((layout.order or '<')+extra), bufvar, offset)
+				elif kind == 'string': value = "%s[%i:%i].split(b'\\x00')[0].decode()" % (bufvar, offset, offset+size)
+				elif kind == 'list': value = 'np.frombuffer(%s, %s, %i, %i)' % (bufvar, self.dtype(extra[0]), extra[1], offset)
+				else: value = '%s[%i:%i]' % (bufvar, offset, offset+size)
+				self.emit(indent, '%s[%r] = %s' % (target, key, value))
+			offset += size
+
+	def emit_project_part(self, indent, part, num, fields):
+		if fields is None: 
+			self.emit_parse_part(indent, part, num)
+			return
+		key = repr(part.name if part.name else 'unk_%i'%num)
+		valvar = self.var('v')
+		if part.bintype == 'struct':
+			self.emit(indent, '%s = {}' % valvar)
+			if part.struct_name in self.structs: 
+				self.emit(indent, '%s(state, %s)' % (self.project_func(self.structs[part.struct_name].parts, fields), valvar))
+		elif part.bintype == 'list' and part.list_bintype in ['dict', 'struct']:
+			partlist = part.parts if part.list_bintype == 'dict' else (self.structs[part.struct_name].parts if part.struct_name in self.structs else None)
+			call = '%s(state, %%s)' % self.project_func(partlist, fields) if partlist is not None else None
+			self.emit_project_list(indent, part, valvar, call, True)
+		else: 
+			self.emit_parse_part(indent, part, num)
+			return
+		self.emit(indent, 'outval[%s] = %s' % (key, valvar))
+
+	def emit_project_list(self, indent, part, valvar, call, keepvals):
+		sizevar = self.var('n')
+		itemvar = self.var('i')
+		self.emit(indent, '%s = %s' % (sizevar, self.expr_lenval(part)))
+		if keepvals: self.emit(indent, '%s = []' % valvar)
+		self.emit(indent, 'if %s > -1:' % sizevar)
+		self.emit(indent+1, 'for _ in range(%s):' % sizevar)
+		self.emit(indent+2, '%s = {}' % itemvar)
+		if call: self.emit(indent+2, call % itemvar)
+		if keepvals: self.emit(indent+2, '%s.append(%s)' % (valvar, itemvar))
+		if part.list_bintype == 'struct':
+			self.emit(indent, 'elif %s == -1:' % sizevar)
+			self.emit(indent+1, 'while True:')
+			self.emit(indent+2, '%s = {}' % itemvar)
+			if call: self.emit(indent+2, '%s = %s' % (sizevar, call % itemvar))
+			if keepvals: self.emit(indent+2, '%s.append(%s)' % (valvar, itemvar))
+			self.emit(indent+2, "if %s == 'BREAK': break" % (sizevar if call else 'True'))
+
+	def emit_skip_part(self, indent, part):
+		bintype = part.bintype
+		if bintype in ['skip', 'raw', 'string']: self.emit(indent, 'reader.skip(%s)' % self.expr_lenval(part))
+		elif bintype == 'string16': self.emit(indent, 'reader.skip(%s*2)' % self.expr_lenval(part))
+		elif bintype == 'string_t': self.emit(indent, 'reader.string_t()')
+		elif bintype == 'struct':
+			if part.struct_name in self.structs: 
+				self.emit(indent, '%s(state, {})' % self.project_func(self.structs[part.struct_name].parts, {}))
+		elif bintype == 'list':
+			if part.list_bintype in list_bintypes:
+				sizevar = self.var('n')
+				self.emit(indent, '%s = %s' % (sizevar, self.expr_lenval(part)))
+				self.emit(indent, 'if %s > 0: reader.skip(%s*%i)' % (sizevar, sizevar, Struct(scalar_format(part.list_bintype, self.endian)).size))
+				return
+			if part.list_bintype == 'dict': 
+				partlist = part.parts
+				layout = self.layouts.partlist(partlist)
+			elif part.list_bintype == 'struct' and part.struct_name in self.structs: 
+				partlist = self.structs[part.struct_name].parts
+				layout = self.layouts.struct(part.struct_name)
+			else: 
+				self.emit(indent, self.expr_lenval(part))
+				return
+			if layout is not None and layout.size:
+				sizevar = self.var('n')
+				self.emit(indent, '%s = %s' % (sizevar, self.expr_lenval(part)))
+				self.emit(indent, 'if %s > 0: reader.skip(%s*%i)' % (sizevar, sizevar, layout.size))
+			else: 
+				self.emit_project_list(indent, part, None, '%s(state, %%s)' % self.project_func(partlist, {}), False)
+
+	def emit_parse_partlist(self, indent, partlist):
+		startlen = len(self.lines)
+		run = []
+		runlayout = datadef_layout()
+		for num, part in partlist.dispatch:
+			partlayout = self.layouts.part(part, num)
+			if partlayout is not None:
+				if not runlayout.add(partlayout):
+					self.emit_parse_run(indent, run, runlayout)
+					run = []
+					runlayout = datadef_layout()
+					runlayout.add(partlayout)
+				run.append([part, num])
+				continue
+			if run:
+				self.emit_parse_run(indent, run, runlayout)
+				run = []
+				runlayout = datadef_layout()
+			if isinstance(part, datadef_part):
+				if part.type == 'part': self.emit_parse_part(indent, part, num)
+				elif part.type == 'length':
+					if part.name: self.emit(indent, 'state.lengths[%r] = %s' % (part.name, self.expr_size(part)))
+					else: self.emit(indent, "print('length must have a name')")
+			if isinstance(part, datadef_match): self.emit_parse_match(indent, part)
+			if isinstance(part, datadef_jump): self.emit_parse_jump(indent, part)
+			if isinstance(part, datadef_break): 
+				self.emit(indent, "return 'BREAK'")
+				break
+		if run: self.emit_parse_run(indent, run, runlayout)
+		if len(self.lines) == startlen: self.emit(indent, 'pass')
+
+	def emit_parse_run(self, indent, run, runlayout):
+		if len(run) == 1 and runlayout.fields[0][1] != 'struct': 
+			self.emit_parse_part(indent, run[0][0], run[0][1])
+		else:
+			tuplevar = self.var('t')
+			self.emit(indent, '%s = %s(read(%i))' % (tuplevar, self.unpacker(runlayout.get_format()), runlayout.size))
+			self.emit_layout_assign(indent, 'outval', runlayout.fields, tuplevar, 0)
+
+	def emit_layout_assign(self, indent, target, fields, tuplevar, tuplenum):
+		for key, kind, size, extra in fields:
+			if kind == 'struct':
+				valvar = self.var('v')
+				self.emit(indent, '%s = {}' % valvar)
+				tuplenum = self.emit_layout_assign(indent, valvar, extra.fields, tuplevar, tuplenum)
+				self.emit(indent, '%s[%r] = %s' % (target, key, valvar))
+				continue
+			if kind == 'string': value = "%s[%i].split(b'\\x00')[0].decode()" % (tuplevar, tuplenum)
+			elif kind == 'list': value = 'np.frombuffer(%s[%i], %s)' % (tuplevar, tuplenum, self.dtype(extra[0]))
+			else: value = '%s[%i]' % (tuplevar, tuplenum)
+			self.emit(indent, '%s[%r] = %s' % (target, key, value))
+			tuplenum += 1
+		return tuplenum
+
+	def expr_match(self, part):
+		key = 'outval[%r]' % part.name
+		if part.match_int is not None:
+			if part.mode == 'eq': return '%i == %s' % (part.match_int, key)
+			elif part.mode == 'ne': return '%i != %s' % (part.match_int, key)
+			elif part.mode == 'hi': return '%i < %s' % (part.match_int, key)
+			elif part.mode == 'lo': return '%i > %s' % (part.match_int, key)
+			return '%s.match(%s)' % (self.const(part, 'match'), key)
+
+	def emit_parse_jump(self, indent, jump):
+		if len(jump.matches) < 3:
+			for match_obj in jump.matches: self.emit_parse_match(indent, match_obj)
+			return
+		table = []
+		for match_obj in jump.matches:
+			self.funcnum += 1
+			funcname = 'parse_%i' % self.funcnum
+			self.emit_parse_func(funcname, match_obj.parts)
+			table.append('%i: %s' % (match_obj.match_int, funcname))
+		self.funcnum += 1
+		tablename = 'jump_%i' % self.funcnum
+		self.funcs.append('%s = {%s}\n' % (tablename, ', '.join(table)))
+		funcvar = self.var('f')
+		self.emit(indent, '%s = %s.get(outval[%r])' % (funcvar, tablename, jump.name))
+		self.emit(indent, 'if %s is not None:' % funcvar)
+		self.emit(indent+1, '%s = %s(state, outval)' % (funcvar, funcvar))
+		self.emit(indent+1, 'if %s: return %s' % (funcvar, funcvar))
+
+	def emit_parse_match(self, indent, part):
+		cond = self.expr_match(part)
+		if cond is None: self.emit(indent, 'outval[%r]' % part.name)
+		else:
+			self.emit(indent, 'if %s:' % cond)
+			self.emit_parse_partlist(indent+1, part.parts)
+
+	def expr_size(self, part):
+		fmt = scalar_format(part.bintype, self.endian) if part.bintype in size_bintypes else None
+		if fmt is None: return 'None'
+		return '%s(read(%i))[0]' % (self.unpacker(fmt), Struct(fmt).size)
+
+	def expr_lenval(self, part):
+		if part.size_source == 'manual': return str(part.size_manual)
+		elif part.size_source == 'part': return self.expr_size(part.part_size)
+		elif part.size_source == 'lenval': return 'state.lengths[%r]' % part.size_name
+		elif part.size_source == 'fromkey': return 'outval[%r]' % part.size_local_name
+		return 'None'
+
+	def emit_struct_call(self, indent, struct_name, valvar):
+		if struct_name in self.struct_funcs:
+			return '%s(state, %s)' % (self.struct_funcs[struct_name], valvar)
+
+	def emit_parse_part(self, indent, part, num):
+		key = repr(part.name if part.name else 'unk_%i'%num)
+		bintype = part.bintype
+		fmt = scalar_format(bintype, self.endian) if bintype else None
+		if fmt: self.emit(indent, 'outval[%s] = %s(read(%i))[0]' % (key, self.unpacker(fmt), Struct(fmt).size))
+		elif bintype == 'skip': self.emit(indent, 'outval[%s] = reader.skip(%s)' % (key, self.expr_lenval(part)))
+		elif bintype == 'raw': self.emit(indent, 'outval[%s] = read(%s)' % (key, self.expr_lenval(part)))
+		elif bintype == 'string': self.emit(indent, "outval[%s] = read(%s).split(b'\\x00')[0].decode()" % (key, self.expr_lenval(part)))
+		elif bintype == 'string16': self.emit(indent, 'outval[%s] = reader.string16(%s)' % (key, self.expr_lenval(part)))
+		elif bintype == 'string_t': self.emit(indent, 'outval[%s] = reader.string_t()' % key)
+		elif bintype == 'struct':
+			valvar = self.var('v')
+			self.emit(indent, '%s = {}' % valvar)
+			call = self.emit_struct_call(indent, part.struct_name, valvar)
+			if call: self.emit(indent, call)
+			self.emit(indent, 'outval[%s] = %s' % (key, valvar))
+		elif bintype == 'list': 
+			valvar = self.var('v')
+			self.emit_parse_list(indent, part, valvar)
+			self.emit(indent, 'outval[%s] = %s' % (key, valvar))
+		else: self.emit(indent, 'outval[%s] = None' % key)
+
+	def emit_parse_list(self, indent, part, valvar):
+		sizevar = self.var('n')
+		itemvar = self.var('i')
+		list_bintype = part.list_bintype
+		self.emit(indent, '%s = %s' % (sizevar, self.expr_lenval(part)))
+		self.emit(indent, 'if %s > -1:' % sizevar)
+		arraylayout = None
+		if self.struct_arrays:
+			if list_bintype == 'dict': arraylayout = self.layouts.partlist(part.parts)
+			elif list_bintype == 'struct': arraylayout = self.layouts.struct(part.struct_name)
+		arraydtype = arraylayout.get_dtype_spec() if arraylayout is not None and arraylayout.size else None
+		if arraydtype is not None:
+			self.emit(indent+1, '%s = np.frombuffer(read(%s*%i), %s)' % (valvar, sizevar, arraylayout.size, self.const(arraydtype, 'dtype', 'dtype')))
+		elif list_bintype == 'dict':
+			self.funcnum += 1
+			funcname = 'parse_%i' % self.funcnum
+			self.emit(indent+1, '%s = []' % valvar)
+			self.emit(indent+1, 'for _ in range(%s):' % sizevar)
+			self.emit(indent+2, '%s = {}' % itemvar)
+			self.emit(indent+2, '%s(state, %s)' % (funcname, itemvar))
+			self.emit(indent+2, '%s.append(%s)' % (valvar, itemvar))
+			self.emit_parse_func(funcname, part.parts)
+		elif list_bintype in list_bintypes:
+			self.emit(indent+1, '%s = reader.list_%s(%s)' % (valvar, list_bintype, sizevar))
+		elif list_bintype == 'struct':
+			self.emit(indent+1, '%s = []' % valvar)
+			self.emit(indent+1, 'for _ in range(%s):' % sizevar)
+			self.emit(indent+2, '%s = {}' % itemvar)
+			call = self.emit_struct_call(indent+2, part.struct_name, itemvar)
+			if call: self.emit(indent+2, call)
+			self.emit(indent+2, '%s.append(%s)' % (valvar, itemvar))
+		else: self.emit(indent+1, '%s = None' % valvar)
+		if list_bintype == 'struct':
+			self.emit(indent, 'elif %s == -1:' % sizevar)
+			self.emit(indent+1, '%s = []' % valvar)
+			self.emit(indent+1, 'while True:')
+			self.emit(indent+2, '%s = {}' % itemvar)
+			call = self.emit_struct_call(indent+2, part.struct_name, itemvar)
+			self.emit(indent+2, '%s.append(%s)' % (valvar, itemvar))
+			self.emit(indent+2, "if %s == 'BREAK': break" % (call if call else 'None'))
+		self.emit(indent, 'else: %s = None' % valvar)
+
+def datadef_source_hash():
+	global DATADEF_SOURCE_HASH
+	if DATADEF_SOURCE_HASH is None:
+		import hashlib
+		try:
+			with open(__file__, 'rb') as f: DATADEF_SOURCE_HASH = hashlib.sha256(f.read()).hexdigest()[:16]
+		except OSError: return None
+	return DATADEF_SOURCE_HASH
 
 class datadef_file:
 	def __init__(self):
 		self.structs = {}
+		self.compiled = {}
+		self.skip_funcs = {}
+		self.use_compiled = True
+
+	def __getstate__(self):
+		state = self.__dict__.copy()
+		state['skip_funcs'] = {}
+		return state
 
-	def load_from_file(self, filename):
+	def get_compiled(self, endian, struct_arrays=False, structname=None, fields=None):
+		key = (endian, struct_arrays) if fields is None else (endian, structname, fields_key(fields))
+		if key not in self.compiled: self.compiled[key] = datadef_compiler(self.structs, endian, struct_arrays).compile(structname, fields)
+		return self.compiled[key]
+
+	def load_from_file(self, filename, cache_dir=None):
 		self.__init__()
+		cache_filename = None
+		if cache_dir is not None:
+			cache_filename = self.get_cache_filename(filename, cache_dir)
+			if cache_filename is not None and self.load_cache(cache_filename): return
 		import xml.etree.ElementTree as ET
 		tree = ET.parse(filename)
 		root = tree.getroot()
 		self.read_xml(root)
+		if cache_filename is not None:
+			if self.use_compiled: self.get_compiled(0)
+			self.save_cache(cache_filename)
+
+	def get_cache_filename(self, filename, cache_dir):
+		import hashlib
+		sourcehash = datadef_source_hash()
+		if sourcehash is None: return None
+		with open(filename, 'rb') as f: hashval = hashlib.sha256(f.read()).hexdigest()
+		return os.path.join(cache_dir, '%s.%s.v%i.%s.ddefc' % (hashval, sys.implementation.cache_tag, DATADEF_CACHE_VERSION, sourcehash))
+
+	def load_cache(self, cache_filename):
+		import pickle
+		try:
+			with open(cache_filename, 'rb') as f: cachedata = pickle.load(f)
+			structs = cachedata['structs']
+			compiled = cachedata['compiled']
+		except Exception: return False
+		self.structs = structs
+		self.compiled = compiled
+		return True
+
+	def save_cache(self, cache_filename):
+		import pickle
+		os.makedirs(os.path.dirname(cache_filename) or '.', exist_ok=True)
+		tempname = '%s.%i.tmp' % (cache_filename, os.getpid())
+		with open(tempname, 'wb') as f: pickle.dump({'structs': self.structs, 'compiled': self.compiled}, f, pickle.HIGHEST_PROTOCOL)
+		os.replace(tempname, cache_filename)
 
 	def read_xml(self, xmldata):
 		for x in xmldata:
@@ -466,27 +1498,101 @@ class datadef_file:
 				struct_obj.read(x)
 				self.structs[x.get('name')] = struct_obj
 
-	def parse_data(self, data, structname):
-		state = datadef_parse_state_reader()
-		state.reader.load_data(data)
+	def internal_parse(self, state, structname, struct_arrays=False, lazy=False, profiler=None, columnar=False, fields=None):
+		if columnar and not lazy: return columnar_value(self.internal_parse(state, structname, profiler is None and fields is None, False, profiler, False, fields))
 		state.structs = self.structs
+		state.profiler = profiler
+		if fields is not None and not lazy:
+			state.profiler = None
+			state.compiled = self.get_compiled(state.reader.state.endian, False, structname, fields_tree(fields)).parsers
+		elif (self.use_compiled or struct_arrays) and not DEBUGTXT and profiler is None: 
+			state.compiled = self.get_compiled(state.reader.state.endian, struct_arrays).parsers
+		if lazy and structname in self.structs:
+			state.layouts = datadef_layouts(self.structs, state.reader.state.endian)
+			if self.use_compiled and not DEBUGTXT and profiler is None: state.layouts.skip_funcs = self.skip_funcs.setdefault(state.reader.state.endian, {})
+			return datadef_lazy_record(state, self.structs[structname].parts, state.reader.tell_real(), {})
 		outval = {}
-		if structname in self.structs: self.structs[structname].parse(state, outval)
+		if structname in self.structs: state.parse_struct(structname, outval)
 		return outval
 
-	def parse_file(self, filename, structname):
+	def parse_data(self, data, structname, struct_arrays=False, lazy=False, profiler=None, columnar=False, fields=None):
+		state = datadef_parse_state_reader()
+		state.reader.load_data(data)
+		return self.internal_parse(state, structname, struct_arrays, lazy, profiler, columnar, fields)
+
+	def parse_file(self, filename, structname, struct_arrays=False, lazy=False, profiler=None, columnar=False, fields=None):
+		state = datadef_parse_state_reader()
+		state.reader.load_file(filename)
+		return self.internal_parse(state, structname, struct_arrays, lazy, profiler, columnar, fields)
+
+	def iter_file(self, filename, structname, list_path, header=None):
 		state = datadef_parse_state_reader()
 		state.reader.load_file(filename)
 		state.structs = self.structs
-		outval = {}
-		if structname in self.structs: self.structs[structname].parse(state, outval)
-		return outval
+		if self.use_compiled and not DEBUGTXT: state.compiled = self.get_compiled(state.reader.state.endian).parsers
+		if header is None: header = {}
+		if structname in self.structs:
+			yield from self.structs[structname].parts.iter_path(state, header, list_path.split('/'))
+
+	def parse_files(self, paths, structname, workers=None, ordered=True, struct_arrays=False, max_pending=None):
+		if workers is not None and workers <= 1:
+			for path in paths: yield datadef_worker_parse(path, structname, struct_arrays, self)
+			return
+		from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+		from collections import deque
+		from functools import partial
+		from itertools import islice
+		if workers is None: workers = os.cpu_count() or 1
+		if max_pending is None: max_pending = workers*4
+		if self.use_compiled: self.get_compiled(0, struct_arrays)
+		paths = iter(paths)
+		with ProcessPoolExecutor(workers, initializer=datadef_worker_init, initargs=(self,)) as executor:
+			submit = partial(executor.submit, datadef_worker_parse, structname=structname, struct_arrays=struct_arrays)
+			if ordered:
+				pending = deque([submit(x) for x in islice(paths, max_pending)])
+				while pending:
+					result = pending.popleft().result()
+					for x in islice(paths, 1): pending.append(submit(x))
+					yield result
+			else:
+				pending = set([submit(x) for x in islice(paths, max_pending)])
+				while pending:
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					for x in islice(paths, len(done)): pending.add(submit(x))
+					for future in done: yield future.result()
+
+	def calc_dump_size(self, structname, inval, endian=0):
+		return datadef_dump_state(self.structs, endian).dump_struct(structname, inval, None, 0)
+
+	def dump_into(self, structname, inval, buf, offset=0, endian=0):
+		return datadef_dump_state(self.structs, endian).dump_struct(structname, inval, buf, offset)
 
 	def dump_bytes(self, structname, inval):
-		state = datadef_parse_state_writer()
-		state.structs = self.structs
-		if structname in self.structs: 
-			self.structs[structname].write(state, inval)
-			return state.writer.getvalue()
-		else: return b''
+		if structname not in self.structs: return b''
+		buf = bytearray(self.calc_dump_size(structname, inval))
+		self.dump_into(structname, inval, buf)
+		return bytes(buf)
+
+	def dump_file(self, structname, inval, filename):
+		import mmap
+		size = self.calc_dump_size(structname, inval)
+		with open(filename, 'w+b') as f:
+			f.truncate(size)
+			if size:
+				with mmap.mmap(f.fileno(), size) as buf: 
+					self.dump_into(structname, inval, buf)
+					buf.flush()
+
+
+datadef_worker_file = None
+
+def datadef_worker_init(datadef_obj):
+	global datadef_worker_file
+	datadef_worker_file = datadef_obj
 
+def datadef_worker_parse(path, structname, struct_arrays, datadef_obj=None):
+	if datadef_obj is None: datadef_obj = datadef_worker_file
+	try: 
+		if not os.path.isfile(path): raise FileNotFoundError(path)
+		return path, datadef_obj.parse_file(path, structname, struct_arrays), None
+	except Exception as e: return path, None, e
@@ -3,12 +3,25 @@
 # easybinrw is MIT
 
 from struct import *
-import mmap
 import os
-import numpy as np
-import sys
 import io
-import varint
+import types
+import bisect
+
+class lazy_dtype:
+	__slots__ = ['code', 'owner', 'name']
+	def __init__(self, code):
+		self.code = code
+
+	def __set_name__(self, owner, name):
+		self.owner = owner
+		self.name = name
+
+	def __get__(self, obj, objtype=None):
+		import numpy as np
+		dtype = np.dtype(self.code)
+		setattr(self.owner, self.name, dtype)
+		return dtype
 
 def val_to_flags(numbits, value):
 	return [b for b in range(numbits) if value&(1<<b)]
@@ -24,6 +37,21 @@ class binrw_state:
 		self.endian = 0
 		self.oldpos = 0
 
+class binrw_compressed_state(binrw_state):
+	__slots__ = ['stream', 'fixed_end']
+	def __init__(self, stream=None):
+		binrw_state.__init__(self)
+		self.stream = stream
+		self.fixed_end = None
+
+	@property
+	def end(self): return self.fixed_end if self.fixed_end is not None else self.stream.get_size()
+
+	@end.setter
+	def end(self, value): self.fixed_end = value
+
+	def end_known(self): return self.fixed_end is not None or self.stream.size is not None
+
 class binread:
 	unp_s8 = Struct('b').unpack
 	unp_u8 = Struct('B').unpack
@@ -46,35 +74,35 @@ class binread:
 	unp_float_l = Struct('<f').unpack
 	unp_double_l = Struct('<d').unpack
 
-	dt_s8 = np.dtype('b')
-	dt_u8 = np.dtype('B')
-
-	dt_s16_n = np.dtype('h')
-	dt_u16_n = np.dtype('H')
-	dt_s32_n = np.dtype('i')
-	dt_u32_n = np.dtype('I')
-	dt_s64_n = np.dtype('q')
-	dt_u64_n = np.dtype('Q')
-	dt_float_n = np.dtype('f')
-	dt_double_n = np.dtype('d')
-
-	dt_s16_b = np.dtype('>h')
-	dt_u16_b = np.dtype('>H')
-	dt_s32_b = np.dtype('>i')
-	dt_u32_b = np.dtype('>I')
-	dt_s64_b = np.dtype('>q')
-	dt_u64_b = np.dtype('>Q')
-	dt_float_b = np.dtype('>f')
-	dt_double_b = np.dtype('>d')
-
-	dt_s16_l = np.dtype('<h')
-	dt_u16_l = np.dtype('<H')
-	dt_s32_l = np.dtype('<i')
-	dt_u32_l = np.dtype('<I')
-	dt_s64_l = np.dtype('<q')
-	dt_u64_l = np.dtype('<Q')
-	dt_float_l = np.dtype('<f')
-	dt_double_l = np.dtype('<d')
+	dt_s8 = lazy_dtype('b')
+	dt_u8 = lazy_dtype('B')
+
+	dt_s16_n = lazy_dtype('h')
+	dt_u16_n = lazy_dtype('H')
+	dt_s32_n = lazy_dtype('i')
+	dt_u32_n = lazy_dtype('I')
+	dt_s64_n = lazy_dtype('q')
+	dt_u64_n = lazy_dtype('Q')
+	dt_float_n = lazy_dtype('f')
+	dt_double_n = lazy_dtype('d')
+
+	dt_s16_b = lazy_dtype('>h')
+	dt_u16_b = lazy_dtype('>H')
+	dt_s32_b = lazy_dtype('>i')
+	dt_u32_b = lazy_dtype('>I')
+	dt_s64_b = lazy_dtype('>q')
+	dt_u64_b = lazy_dtype('>Q')
+	dt_float_b = lazy_dtype('>f')
+	dt_double_b = lazy_dtype('>d')
+
+	dt_s16_l = lazy_dtype('<h')
+	dt_u16_l = lazy_dtype('<H')
+	dt_s32_l = lazy_dtype('<i')
+	dt_u32_l = lazy_dtype('<I')
+	dt_s64_l = lazy_dtype('<q')
+	dt_u64_l = lazy_dtype('<Q')
+	dt_float_l = lazy_dtype('<f')
+	dt_double_l = lazy_dtype('<d')
 
 	def __init__(self):
 		self.str = None
@@ -83,6 +111,7 @@ class binread:
 		self.filenum = None
 		self.filename = None
 		self.is_file = False
+		self.data = None
 
 		self.state = binrw_state()
 		self.state_store = []
@@ -96,6 +125,7 @@ class binread:
 			self.filename = filename
 			self.is_file = True
 
+			import mmap
 			self.str = mmap.mmap(self.filenum, 0, access=mmap.ACCESS_READ)
 			self.state.end = os.path.getsize(filename)
 			return True
@@ -104,9 +134,21 @@ class binread:
 			return False
 
 	def load_data(self, data):
+		if not isinstance(data, bytes): data = bytes(data)
+		self.data = data
 		self.str = io.BytesIO(data)
 		self.state.end = len(data)
 
+	def load_compressed(self, source, codec=None, **kwargs):
+		self.data = None
+		self.str = binrw_compressed_stream(source, codec, **kwargs)
+		self.state = binrw_compressed_state(self.str)
+
+	def close(self):
+		if self.str is not None: self.str.close()
+		if self.file is not None: self.file.close()
+		self.__init__()
+
 	def fileno(self): return self.filenum
 
 	def magic_check(self, bind): assert bind==self.str.read(len(bind))
@@ -121,7 +163,9 @@ class binread:
 	def skip(self, num): return self.str.seek(self.str.tell()+num)
 
 	def remaining(self): return max(0, self.state.end-self.str.tell())
-	def rest(self): return self.str.read(self.remaining())
+	def rest(self): 
+		if isinstance(self.state, binrw_compressed_state) and not self.state.end_known(): return self.str.read()
+		return self.str.read(self.remaining())
 
 	def isolate_range_real(self, start, end):
 		oldpos = self.state.oldpos = self.str.tell()
@@ -174,7 +218,9 @@ class binread:
 	def int_u64(self): return (self.unp_u64_b if self.state.endian else self.unp_u64_l)(self.str.read(8))[0] 
 	def float(self): return (self.unp_float_b if self.state.endian else self.unp_float_l)(self.str.read(4))[0] 
 	def double(self): return (self.unp_double_b if self.state.endian else self.unp_double_l)(self.str.read(8))[0] 
-	def varint(self): return varint.decode_stream(self.str)
+	def varint(self): 
+		import varint
+		return varint.decode_stream(self.str)
 
 	def int_s16_b(self): return self.unp_s16_b(self.str.read(2))[0]
 	def int_u16_b(self): return self.unp_u16_b(self.str.read(2))[0]
@@ -199,6 +245,13 @@ class binread:
 	def int_u24_l(self): return self.unp_s32_l(self.str.read(3)+b'\x00')[0]
 
 	def raw(self, num): return self.str.read(num)
+	def view(self, num): 
+		pos = self.str.tell()
+		self.str.seek(pos+num)
+		if self.is_file: return memoryview(self.str)[pos:pos+num]
+		elif self.data is not None: return memoryview(self.data)[pos:pos+num]
+		elif isinstance(self.str, binrw_compressed_stream): return memoryview(self.str.internal_read_at(pos, pos+num))
+		else: return self.str.getbuffer()[pos:pos+num]
 	def string(self, num, **k): return self.str.read(num).split(b'\x00')[0].decode(**k)
 	def string16(self, num, **k): 
 		outtxt = b''
@@ -267,6 +320,7 @@ class binread:
 	def raw_i64_l(self): return self.str.read(self.int_u64_l())
 
 	def internal_readarr(self, num, numbytes, dtype): 
+		import numpy as np
 		byteds = self.read(num*numbytes)
 		return np.frombuffer(byteds, dtype)
 
@@ -312,6 +366,36 @@ class binread:
 		self.seek(offset)
 		return self.str.read(len(data))==data
 
+	def internal_scan_data(self):
+		stream = self.str
+		if isinstance(stream, binrw_traced_stream): stream = stream.stream
+		if self.is_file or isinstance(stream, binrw_compressed_stream): return stream
+		return self.data if self.data is not None else stream.getvalue()
+
+	def internal_scan_range(self, start, end):
+		if start is None: start = self.str.tell()
+		if end is None and not (isinstance(self.state, binrw_compressed_state) and not self.state.end_known()): end = self.state.end
+		return start, end
+
+	def find(self, pattern, start=None, end=None):
+		start, end = self.internal_scan_range(start, end)
+		return self.internal_scan_data().find(pattern, start, end)
+
+	def finditer(self, patterns, start=None, end=None):
+		start, end = self.internal_scan_range(start, end)
+		if isinstance(patterns, (bytes, bytearray)): patterns = [patterns]
+		patterns = sorted(set([bytes(x) for x in patterns]), key=len, reverse=True)
+		data = self.internal_scan_data()
+		if len(patterns) == 1: return self.internal_finditer_single(data, patterns[0], start, end)
+		import heapq
+		return heapq.merge(*[self.internal_finditer_single(data, x, start, end) for x in patterns], key=lambda x: (x[0], -len(x[1])))
+
+	def internal_finditer_single(self, data, pattern, start, end):
+		pos = data.find(pattern, start, end)
+		while pos != -1:
+			yield pos, pattern
+			pos = data.find(pattern, pos+1, end)
+
 class binwrite:
 	pak_s8 = Struct('b').pack
 	pak_u8 = Struct('B').pack
@@ -334,35 +418,35 @@ class binwrite:
 	pak_float_l = Struct('<f').pack
 	pak_double_l = Struct('<d').pack
 
-	dt_s8 = np.dtype('b')
-	dt_u8 = np.dtype('B')
-
-	dt_s16_n = np.dtype('h')
-	dt_u16_n = np.dtype('H')
-	dt_s32_n = np.dtype('i')
-	dt_u32_n = np.dtype('I')
-	dt_s64_n = np.dtype('q')
-	dt_u64_n = np.dtype('Q')
-	dt_float_n = np.dtype('f')
-	dt_double_n = np.dtype('d')
-
-	dt_s16_b = np.dtype('>h')
-	dt_u16_b = np.dtype('>H')
-	dt_s32_b = np.dtype('>i')
-	dt_u32_b = np.dtype('>I')
-	dt_s64_b = np.dtype('>q')
-	dt_u64_b = np.dtype('>Q')
-	dt_float_b = np.dtype('>f')
-	dt_double_b = np.dtype('>d')
-
-	dt_s16_l = np.dtype('<h')
-	dt_u16_l = np.dtype('<H')
-	dt_s32_l = np.dtype('<i')
-	dt_u32_l = np.dtype('<I')
-	dt_s64_l = np.dtype('<q')
-	dt_u64_l = np.dtype('<Q')
-	dt_float_l = np.dtype('<f')
-	dt_double_l = np.dtype('<d')
+	dt_s8 = lazy_dtype('b')
+	dt_u8 = lazy_dtype('B')
+
+	dt_s16_n = lazy_dtype('h')
+	dt_u16_n = lazy_dtype('H')
+	dt_s32_n = lazy_dtype('i')
+	dt_u32_n = lazy_dtype('I')
+	dt_s64_n = lazy_dtype('q')
+	dt_u64_n = lazy_dtype('Q')
+	dt_float_n = lazy_dtype('f')
+	dt_double_n = lazy_dtype('d')
+
+	dt_s16_b = lazy_dtype('>h')
+	dt_u16_b = lazy_dtype('>H')
+	dt_s32_b = lazy_dtype('>i')
+	dt_u32_b = lazy_dtype('>I')
+	dt_s64_b = lazy_dtype('>q')
+	dt_u64_b = lazy_dtype('>Q')
+	dt_float_b = lazy_dtype('>f')
+	dt_double_b = lazy_dtype('>d')
+
+	dt_s16_l = lazy_dtype('<h')
+	dt_u16_l = lazy_dtype('<H')
+	dt_s32_l = lazy_dtype('<i')
+	dt_u32_l = lazy_dtype('<I')
+	dt_s64_l = lazy_dtype('<q')
+	dt_u64_l = lazy_dtype('<Q')
+	dt_float_l = lazy_dtype('<f')
+	dt_double_l = lazy_dtype('<d')
 
 	def __init__(self):
 		self.str = io.BytesIO()
@@ -370,9 +454,21 @@ class binwrite:
 		self.state = binrw_state()
 		self.state_store = []
 
+	def open_file(self, filename):
+		self.file = open(filename, 'wb')
+		self.str = self.file
+
+	def close(self):
+		if self.file is not None:
+			self.file.close()
+			self.file = None
+			self.str = io.BytesIO()
+
 	def tell(self): return self.str.tell()
+	def seek(self, num): return self.str.seek(num)
 
 	def internal_writearr(self, v, num, dtype): 
+		import numpy as np
 		if 0>num: 
 			iv = np.array(v, dtype)
 			self.str.write(iv.tobytes())
@@ -401,7 +497,9 @@ class binwrite:
 	def int_u64(self, v): self.str.write((self.pak_u64_b if self.state.endian else self.pak_u64_l)(v))
 	def float(self, v): self.str.write((self.pak_float_b if self.state.endian else self.pak_float_l)(v))
 	def double(self, v): self.str.write((self.pak_double_b if self.state.endian else self.pak_double_l)(v))
-	def varint(self, v): self.str.write(varint.encode(v))
+	def varint(self, v): 
+		import varint
+		self.str.write(varint.encode(v))
 
 	def int_s16_b(self, v): self.str.write(self.pak_s16_b(v))
 	def int_u16_b(self, v): self.str.write(self.pak_u16_b(v))
@@ -422,18 +520,9 @@ class binwrite:
 	def double_l(self, v): self.str.write(self.pak_double_l(v))
 
 	def raw(self, v): self.str.write(v)
-	def raw_n(self, v, num):
-		outtxt = np.zeros(1, (np.void, num))
-		outtxt[:] = v
-		self.str.write(outtxt[0])
-	def string(self, v, num, **k):
-		outtxt = np.zeros(1, (np.void, num))
-		outtxt[:] = str(v).encode(**k)
-		self.str.write(outtxt[0])
-	def string16(self, v, num):
-		outtxt = np.zeros(1, (np.void, num))
-		outtxt[:] = str(v).encode('utf16')
-		self.str.write(outtxt[0])
+	def raw_n(self, v, num): self.str.write(bytes(v)[:num].ljust(num, b'\x00'))
+	def string(self, v, num, **k): self.str.write(str(v).encode(**k)[:num].ljust(num, b'\x00'))
+	def string16(self, v, num): self.str.write(str(v).encode('utf16')[:num].ljust(num, b'\x00'))
 	def string_nolimit(self, v): self.str.write(str(v).encode())
 	def string_t(self, v): 
 		self.str.write(str(v).encode())
@@ -512,3 +601,355 @@ class binwrite:
 	def list_float_l(self, v, num): self.internal_writearr(v, num, self.dt_float_l)
 	def list_double_l(self, v, num): self.internal_writearr(v, num, self.dt_double_l)
 
+def detect_codec(head):
+	if head[:2] == b'\x1f\x8b': return 'gzip'
+	if head[:3] == b'BZh': return 'bz2'
+	if head[:6] == b'\xfd7zXZ\x00' or head[:1] == b'\x5d': return 'lzma'
+	if len(head) >= 2 and head[0]&0x0f == 8 and ((head[0]<<8)|head[1])%31 == 0: return 'zlib'
+	raise ValueError('unknown compression format')
+
+class binrw_compressed_cursor:
+	__slots__ = ['obj', 'in_pos', 'out_pos', 'tail']
+	def __init__(self, obj, in_pos, out_pos):
+		self.obj = obj
+		self.in_pos = in_pos
+		self.out_pos = out_pos
+		self.tail = b''
+
+class binrw_compressed_stream:
+	zlib_wbits = {'zlib': 15, 'gzip': 31, 'deflate': -15}
+	stream_magic = {'gzip': b'\x1f\x8b', 'bz2': b'BZh', 'lzma': b'\xfd7zXZ\x00'}
+
+	def __init__(self, source, codec=None, window_size=1<<18, cache_windows=16, index_interval=1<<22, read_size=1<<16):
+		if isinstance(source, (bytes, bytearray, memoryview)):
+			self.raw = io.BytesIO(source)
+			self.owns_raw = True
+		elif isinstance(source, (str, os.PathLike)):
+			self.raw = open(source, 'rb')
+			self.owns_raw = True
+		else:
+			self.raw = source
+			self.owns_raw = False
+
+		try:
+			if codec is None:
+				self.raw.seek(0)
+				codec = detect_codec(self.raw.read(6))
+			if codec == 'xz': codec = 'lzma'
+			if codec not in self.zlib_wbits and codec not in ('bz2', 'lzma'): raise ValueError('unknown codec: %s' % codec)
+		except:
+			if self.owns_raw: self.raw.close()
+			raise
+		self.codec = codec
+		self.is_zlib = codec in self.zlib_wbits
+
+		self.window_size = window_size
+		self.cache_windows = max(1, cache_windows)
+		self.index_interval = max(window_size, index_interval)
+		self.read_size = read_size
+
+		from collections import OrderedDict
+		self.cache = OrderedDict()
+		self.current_num = -1
+		self.current_data = b''
+		self.checkpoint_pos = [0]
+		self.checkpoints = [(0, None)]
+		self.cursor = None
+		self.pos = 0
+		self.size = None
+		self.closed = False
+
+	def internal_decompressor(self):
+		if self.is_zlib:
+			import zlib
+			return zlib.decompressobj(self.zlib_wbits[self.codec])
+		if self.codec == 'bz2':
+			import bz2
+			return bz2.BZ2Decompressor()
+		import lzma
+		return lzma.LZMADecompressor()
+
+	def internal_raw_read(self, cursor):
+		self.raw.seek(cursor.in_pos)
+		data = self.raw.read(self.read_size)
+		cursor.in_pos += len(data)
+		return data
+
+	def internal_add_checkpoint(self, cursor, obj, spacing):
+		if cursor.out_pos-self.checkpoint_pos[-1] < spacing: return
+		self.checkpoint_pos.append(cursor.out_pos)
+		self.checkpoints.append((cursor.in_pos-len(cursor.tail), obj.copy() if obj is not None else None))
+
+	def internal_next_stream(self, cursor):
+		magic = self.stream_magic.get(self.codec)
+		if magic is None: return False
+		leftover = cursor.obj.unused_data
+		while len(leftover) < len(magic):
+			data = self.internal_raw_read(cursor)
+			if not data: break
+			leftover += data
+		if not leftover.startswith(magic): return False
+		cursor.obj = self.internal_decompressor()
+		cursor.tail = leftover
+		self.internal_add_checkpoint(cursor, None, self.window_size)
+		return True
+
+	def internal_decode(self, cursor, count, keep=True):
+		out = []
+		while count > 0:
+			obj = cursor.obj
+			if obj.eof:
+				if self.internal_next_stream(cursor): continue
+				self.size = cursor.out_pos
+				break
+			if self.is_zlib or obj.needs_input:
+				data = cursor.tail or self.internal_raw_read(cursor)
+				cursor.tail = b''
+			else: data = b''
+			chunk = obj.decompress(data, min(count, self.window_size))
+			if self.is_zlib: cursor.tail = obj.unconsumed_tail
+			if chunk:
+				cursor.out_pos += len(chunk)
+				count -= len(chunk)
+				if keep: out.append(chunk)
+				if self.is_zlib and not obj.eof: self.internal_add_checkpoint(cursor, obj, self.index_interval)
+			elif not data and not obj.eof: raise EOFError('compressed data ended before the end-of-stream marker')
+		return b''.join(out)
+
+	def internal_cursor(self, start):
+		point = bisect.bisect_right(self.checkpoint_pos, start)-1
+		cursor = self.cursor
+		if cursor is not None and self.checkpoint_pos[point] <= cursor.out_pos <= start: return cursor
+		in_pos, obj = self.checkpoints[point]
+		return binrw_compressed_cursor(obj.copy() if obj is not None else self.internal_decompressor(), in_pos, self.checkpoint_pos[point])
+
+	def get_size(self):
+		if self.size is None:
+			start = self.checkpoint_pos[-1]
+			if self.cursor is not None: start = max(start, self.cursor.out_pos)
+			cursor = self.internal_cursor(start)
+			while self.size is None: self.internal_decode(cursor, self.index_interval, False)
+			self.cursor = cursor
+		return self.size
+
+	def internal_window(self, num):
+		cache = self.cache
+		data = cache.get(num)
+		if data is not None:
+			cache.move_to_end(num)
+			return data
+		start = num*self.window_size
+		if self.size is not None and start >= self.size: return b''
+		cursor = self.internal_cursor(start)
+		if cursor.out_pos < start: self.internal_decode(cursor, start-cursor.out_pos, False)
+		data = self.internal_decode(cursor, self.window_size)
+		self.cursor = cursor
+		cache[num] = data
+		if len(cache) > self.cache_windows: cache.popitem(False)
+		return data
+
+	def internal_read_at(self, pos, end):
+		size = self.window_size
+		num = pos//size
+		if num != self.current_num:
+			self.current_data = self.internal_window(num)
+			self.current_num = num
+		winstart = num*size
+		if end is not None and end-winstart <= len(self.current_data): return self.current_data[pos-winstart:end-winstart]
+		out = []
+		while end is None or pos < end:
+			num = pos//size
+			winstart = num*size
+			data = self.internal_window(num)
+			out.append(data[pos-winstart:None if end is None else end-winstart])
+			if len(data) < size: break
+			pos = winstart+size
+		return b''.join(out)
+
+	def read(self, num=-1):
+		pos = self.pos
+		data = self.internal_read_at(pos, None if num is None or num < 0 else pos+num)
+		self.pos = pos+len(data)
+		return data
+
+	def seek(self, pos, whence=0):
+		if whence == 1: pos += self.pos
+		elif whence == 2: pos += self.get_size()
+		if pos < 0: raise ValueError('negative seek value %i' % pos)
+		self.pos = pos
+		return pos
+
+	def tell(self): return self.pos
+
+	def find(self, pattern, start=0, end=None):
+		pattern = bytes(pattern)
+		size = self.window_size
+		pos = max(0, start)
+		while end is None or pos+len(pattern) <= end:
+			nextpos = (pos//size+1)*size
+			segend = nextpos+len(pattern)-1
+			if end is not None: segend = min(segend, end)
+			data = self.internal_read_at(pos, segend)
+			found = data.find(pattern)
+			if found != -1: return pos+found
+			if len(data) < segend-pos: break
+			pos = nextpos
+		return -1
+
+	def close(self):
+		if self.owns_raw and not self.closed: self.raw.close()
+		self.cache.clear()
+		self.current_data = b''
+		self.current_num = -1
+		self.cursor = None
+		self.checkpoints = []
+		self.closed = True
+
+class binrw_traced_stream:
+	__slots__ = ['stream', 'tracer']
+	def __init__(self, stream, tracer):
+		self.stream = stream
+		self.tracer = tracer
+
+	def __getattr__(self, name): return getattr(self.stream, name)
+
+	def read(self, *args):
+		pos = self.stream.tell()
+		out = self.stream.read(*args)
+		self.tracer.record_access(pos, len(out), False)
+		return out
+
+	def write(self, data):
+		pos = self.stream.tell()
+		out = self.stream.write(data)
+		self.tracer.record_access(pos, len(data), True)
+		return out
+
+	def seek(self, *args):
+		pos = self.stream.tell()
+		out = self.stream.seek(*args)
+		self.tracer.record_seek(pos, self.stream.tell())
+		return out
+
+class binrw_tracer:
+	def __init__(self, bucket_size=None):
+		self.bucket_size = bucket_size
+		self.accessors = {}
+		self.histogram = {}
+		self.bytes_read = 0
+		self.bytes_written = 0
+		self.reads = 0
+		self.writes = 0
+		self.seeks = 0
+		self.seek_distance = 0
+		self.jumps = 0
+		self.jumps_back = 0
+		self.lastend = None
+
+	def clear(self):
+		self.__init__(self.bucket_size)
+
+	def attach(self, obj):
+		obj.__class__ = traced_class(type(obj))
+		obj.tracer = self
+		if obj.str is not None and not isinstance(obj.str, binrw_traced_stream): obj.str = binrw_traced_stream(obj.str, self)
+		return obj
+
+	def detach(self, obj):
+		if isinstance(obj.str, binrw_traced_stream): obj.str = obj.str.stream
+		obj.__class__ = obj.traced_base
+		del obj.tracer
+		return obj
+
+	def record_access(self, pos, size, is_write):
+		if is_write:
+			self.writes += 1
+			self.bytes_written += size
+		else:
+			self.reads += 1
+			self.bytes_read += size
+		if self.lastend is not None and pos != self.lastend:
+			self.jumps += 1
+			if pos < self.lastend: self.jumps_back += 1
+		self.lastend = pos+size
+		if self.bucket_size:
+			bucket = pos//self.bucket_size
+			self.histogram[bucket] = self.histogram.get(bucket, 0)+1
+
+	def record_seek(self, oldpos, newpos):
+		self.seeks += 1
+		self.seek_distance += abs(newpos-oldpos)
+
+	def record_call(self, name, numbytes, numseeks):
+		stats = self.accessors.get(name)
+		if stats is None: stats = self.accessors[name] = [0, 0, 0]
+		stats[0] += 1
+		stats[1] += numbytes
+		stats[2] += numseeks
+
+	def to_dict(self):
+		out = {}
+		out['bytes_read'] = self.bytes_read
+		out['bytes_written'] = self.bytes_written
+		out['reads'] = self.reads
+		out['writes'] = self.writes
+		out['seeks'] = self.seeks
+		out['seek_distance'] = self.seek_distance
+		out['jumps'] = self.jumps
+		out['jumps_back'] = self.jumps_back
+		out['accessors'] = dict([(k, {'calls': v[0], 'bytes': v[1], 'seeks': v[2]}) for k, v in self.accessors.items()])
+		if self.bucket_size: 
+			out['bucket_size'] = self.bucket_size
+			out['histogram'] = dict(sorted(self.histogram.items()))
+		return out
+
+	def report(self, sort='calls', limit=None):
+		sortnum = {'calls': 0, 'bytes': 1, 'seeks': 2}[sort]
+		rows = sorted(self.accessors.items(), key=lambda x: x[1][sortnum], reverse=True)
+		if limit is not None: rows = rows[:limit]
+		lines = ['%i reads (%i bytes), %i writes (%i bytes), %i seeks, %i jumps (%i backward)' % (self.reads, self.bytes_read, self.writes, self.bytes_written, self.seeks, self.jumps, self.jumps_back), '']
+		lines.append('%10s %12s %10s  %s' % ('ncalls', 'bytes', 'seeks', 'accessor'))
+		for name, stats in rows: lines.append('%10i %12i %10i  %s' % (stats[0], stats[1], stats[2], name))
+		if self.bucket_size and self.histogram:
+			lines.append('')
+			lines.append('%i of %i-byte buckets touched' % (len(self.histogram), self.bucket_size))
+		return '\n'.join(lines)
+
+	def print_stats(self, sort='calls', limit=None):
+		print(self.report(sort, limit))
+
+traced_classes = {}
+
+def internal_trace_method(name, func):
+	def traced(self, *args, **kwargs):
+		tracer = self.tracer
+		startbytes = tracer.bytes_read+tracer.bytes_written
+		startseeks = tracer.seeks
+		try: return func(self, *args, **kwargs)
+		finally:
+			tracer.record_call(name, tracer.bytes_read+tracer.bytes_written-startbytes, tracer.seeks-startseeks)
+			if self.str is not None and not isinstance(self.str, binrw_traced_stream): self.str = binrw_traced_stream(self.str, tracer)
+	traced.__name__ = name
+	traced.__qualname__ = func.__qualname__
+	return traced
+
+def internal_traced_view(self, num):
+	stream = self.str
+	pos = stream.tell()
+	self.str = stream.stream
+	try: out = self.traced_base.view(self, num)
+	finally: self.str = stream
+	stream.tracer.record_access(pos, len(out), False)
+	return out
+
+def traced_class(cls):
+	if 'traced_base' in vars(cls): return cls
+	if cls not in traced_classes:
+		namespace = {'traced_base': cls}
+		for klass in reversed(cls.__mro__):
+			for name, func in vars(klass).items():
+				if name.startswith('__') or not isinstance(func, types.FunctionType): continue
+				if name == 'view': func = internal_traced_view
+				namespace[name] = internal_trace_method(name, func)
+		traced_classes[cls] = type(cls.__name__+'_traced', (cls,), namespace)
+	return traced_classes[cls]
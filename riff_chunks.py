@@ -3,8 +3,32 @@
 # easybinrw is MIT
 
 from external.easybinrw import easybinrw
+import os
+
+list_ids = [b'LIST', b'RIFF', b'RF64']
+size_rf64 = 0xFFFFFFFF
+
+wave_dtypes = {
+	(1, 8): 'u1',
+	(1, 16): '<i2',
+	(1, 32): '<i4',
+	(1, 64): '<i8',
+	(3, 32): '<f4',
+	(3, 64): '<f8',
+	}
+
+def wave_format_dtype(fmtdata):
+	fmtdata = bytes(fmtdata[0:26])
+	formattag = easybinrw.binread.unp_u16_l(fmtdata[0:2])[0]
+	channels = easybinrw.binread.unp_u16_l(fmtdata[2:4])[0]
+	bits = easybinrw.binread.unp_u16_l(fmtdata[14:16])[0]
+	if formattag == 0xFFFE and len(fmtdata) >= 26: formattag = easybinrw.binread.unp_u16_l(fmtdata[24:26])[0]
+	if (formattag, bits) not in wave_dtypes: raise ValueError('unsupported wave format: %i, %i bits' % (formattag, bits))
+	return wave_dtypes[(formattag, bits)], channels
 
 class riff_chunk:
+	__slots__ = ['start', 'end', 'size', 'id', 'is_list', 'data', 'indata_list', 'indata_index', 'is_header', 'loaded_bytes', 'lazy_reader', 'lazy_load_data', 'ds64_sizes']
+
 	def __init__(self):
 		self.start = 0
 		self.end = 0
@@ -12,12 +36,55 @@ class riff_chunk:
 		self.id = b'    '
 		self.is_list = True
 		self.data = None
-		self.indata = []
+		self.indata_list = []
+		self.indata_index = None
 		self.is_header = True
+		self.loaded_bytes = False
+		self.lazy_reader = None
+		self.lazy_load_data = False
+		self.ds64_sizes = None
+
+	@property
+	def indata(self):
+		if self.lazy_reader is not None: self.internal_read_lazy()
+		return self.indata_list
+
+	@indata.setter
+	def indata(self, v):
+		self.indata_list = v
+		self.indata_index = None
 
 	def __getitem__(self, v):
+		if isinstance(v, (str, bytes)): return self.get_path_chain(v)[-1]
 		return self.indata[v]
 
+	def __contains__(self, v):
+		try: 
+			self.get_path_chain(v)
+			return True
+		except KeyError: return False
+
+	def get_index(self):
+		indata = self.indata
+		if self.indata_index is None or self.indata_index[0] != len(indata):
+			index = {}
+			for x in indata:
+				if x.id in index: index[x.id].append(x)
+				else: index[x.id] = [x]
+			self.indata_index = [len(indata), index]
+		return self.indata_index[1]
+
+	def get_path_chain(self, path):
+		if isinstance(path, str): path = path.encode()
+		chain = [self]
+		parts = [x for x in path.split(b'/') if x]
+		for num, name in enumerate(parts):
+			if name in list_ids and num+1 < len(parts): continue
+			index = chain[-1].get_index() if chain[-1].is_list else {}
+			if name not in index: raise KeyError(path)
+			chain.append(index[name][0])
+		return chain
+
 	def iter_reader(self, reader):
 		for x in self.indata:
 			reader.seek_real(x.start)
@@ -25,36 +92,86 @@ class riff_chunk:
 			yield x
 			reader.isolate_end()
 
-	def read_file(self, filename, load_data):
+	def read_file(self, filename, load_data, lazy=False):
 		ebrw_readstr = easybinrw.binread()
 		ebrw_readstr.load_file(filename)
-		self.read(ebrw_readstr, load_data)
+		self.read(ebrw_readstr, load_data, lazy)
 		return ebrw_readstr
 
-	def read(self, reader, load_data):
+	def read(self, reader, load_data, lazy=False, ds64_sizes=None):
 		self.id = reader.raw(4)
 		self.size = reader.int_u32()
 		self.start = reader.tell_real()
+		if self.id == b'RF64': ds64_sizes = self.internal_read_ds64(reader)
+		if self.size == size_rf64 and ds64_sizes and self.id in ds64_sizes: self.size = ds64_sizes[self.id]
+		self.ds64_sizes = ds64_sizes
 		self.end = self.start+self.size
-		if self.id in [b'LIST', b'RIFF']:
-			#print('LIST START')
+		if self.id in list_ids:
 			self.is_list = True
+			self.is_header = self.id != b'LIST'
 			self.id = reader.raw(4)
+			if self.size == size_rf64 and ds64_sizes and not self.is_header and self.id in ds64_sizes:
+				self.size = ds64_sizes[self.id]
+				self.end = self.start+self.size
 			self.size = self.size-4
-			reader.isolate_size(self.size)
-			while reader.remaining():
-				in_ch = riff_chunk()
-				in_ch.read(reader, load_data)
-				self.indata.append(in_ch)
-			reader.isolate_end()
-			#print('LIST END')
+			if lazy:
+				self.lazy_reader = reader
+				self.lazy_load_data = load_data
+				reader.skip(self.size)
+			else:
+				reader.isolate_size(self.size)
+				self.internal_read_inner(reader, load_data, False)
+				reader.isolate_end()
+		elif self.id == b'ds64':
+			self.is_list = False
+			self.data = reader.raw(self.size)
+			if self.size%2: reader.skip(1)
 		else:
 			self.is_list = False
 			if load_data: 
 				self.loaded_bytes = True
-				self.data = reader.raw(self.size)
+				self.data = reader.view(self.size) if load_data == 'view' else reader.raw(self.size)
+				if self.size%2: reader.skip(1)
 			else: reader.skip(self.size+(self.size%2))
-		#print(self.is_list, self.id, self.size, self.start, self.end)
+
+	def internal_read_inner(self, reader, load_data, lazy):
+		while reader.remaining():
+			in_ch = riff_chunk()
+			in_ch.read(reader, load_data, lazy, self.ds64_sizes)
+			self.indata_list.append(in_ch)
+
+	def internal_read_ds64(self, reader):
+		ds64_sizes = {}
+		oldpos = reader.tell_real()
+		reader.skip(4)
+		if reader.raw(4) == b'ds64':
+			reader.int_u32()
+			ds64_sizes[b'RF64'] = reader.int_u64()
+			ds64_sizes[b'data'] = reader.int_u64()
+			reader.int_u64()
+			for _ in range(reader.int_u32()):
+				tableid = reader.raw(4)
+				ds64_sizes[tableid] = reader.int_u64()
+		reader.seek_real(oldpos)
+		return ds64_sizes
+
+	def internal_read_lazy(self):
+		reader = self.lazy_reader
+		self.lazy_reader = None
+		oldpos = reader.tell_real()
+		reader.seek_real(self.start+4)
+		reader.isolate_range_real(self.start+4, self.end)
+		self.internal_read_inner(reader, self.lazy_load_data, True)
+		reader.isolate_end()
+		reader.seek_real(oldpos)
+
+	def as_array(self, dtype):
+		import numpy as np
+		channels = 1
+		if isinstance(dtype, riff_chunk): dtype, channels = wave_format_dtype(dtype.data)
+		dtype = np.dtype(dtype)
+		outarr = np.frombuffer(self.data, dtype, len(self.data)//dtype.itemsize)
+		return outarr.reshape(-1, channels) if channels > 1 else outarr
 
 	def add_part(self, idtxt):
 		in_ch = riff_chunk()
@@ -67,24 +184,34 @@ class riff_chunk:
 		in_ch = riff_chunk()
 		in_ch.id = idtxt
 		in_ch.is_list = True
+		in_ch.is_header = False
 		self.indata.append(in_ch)
 		return in_ch
 
-	def write_chunk(self, ebrw_writestr):
+	def calc_size(self):
+		if not self.is_list: self.size = len(self.data)
+		else:
+			self.size = 0
+			for x in self.indata:
+				insize = x.calc_size()
+				self.size += 8+insize+(insize%2)
+		return self.size+4 if self.is_list else self.size
 
+	def internal_write_chunk(self, ebrw_writestr):
 		if not self.is_list:
 			ebrw_writestr.raw(self.id)
-			outdata = self.data
+			ebrw_writestr.int_u32(self.size)
+			ebrw_writestr.raw(self.data)
+			if (self.size%2): ebrw_writestr.raw(b'\0')
 		else:
 			ebrw_writestr.raw(b'LIST' if not self.is_header else b'RIFF')
-			inner__ebrw_writestr = easybinrw.binwrite()
-			inner__ebrw_writestr.raw(self.id)
-			for x in self.indata: x.write_chunk(inner__ebrw_writestr)
-			outdata = inner__ebrw_writestr.getvalue()
+			ebrw_writestr.int_u32(self.size+4)
+			ebrw_writestr.raw(self.id)
+			for x in self.indata: x.internal_write_chunk(ebrw_writestr)
 
-		ebrw_writestr.int_u32(len(outdata))
-		ebrw_writestr.raw(outdata)
-		if (len(outdata)%2): ebrw_writestr.raw(b'\0')
+	def write_chunk(self, ebrw_writestr):
+		self.calc_size()
+		self.internal_write_chunk(ebrw_writestr)
 
 	def write_data(self):
 		ebrw_writestr = easybinrw.binwrite()
@@ -93,5 +220,197 @@ class riff_chunk:
 
 	def write_to_file(self, filename):
 		ebrw_writestr = easybinrw.binwrite()
+		ebrw_writestr.open_file(filename)
 		self.write_chunk(ebrw_writestr)
-		ebrw_writestr.to_file(filename)
+		ebrw_writestr.close()
+
+class riff_writer:
+	def __init__(self):
+		self.writer = None
+		self.stack = []
+		self.ds64_pos = None
+		self.ds64_table_size = 0
+		self.large_sizes = {}
+		self.size_riff = 0
+		self.sample_count = 0
+
+	def open_file(self, filename, idtxt, rf64_reserve=True, ds64_table_size=0):
+		self.__init__()
+		self.writer = easybinrw.binwrite()
+		self.writer.open_file(filename)
+		self.begin_list(idtxt, True)
+		if rf64_reserve:
+			self.ds64_pos = self.writer.tell()
+			self.ds64_table_size = ds64_table_size
+			self.write_chunk(b'JUNK', bytes(28+(12*ds64_table_size)))
+
+	def begin_list(self, idtxt, is_header=False):
+		self.writer.raw(b'RIFF' if is_header else b'LIST')
+		self.stack.append([self.writer.tell(), b'RIFF' if is_header else idtxt])
+		self.writer.int_u32(0)
+		self.writer.raw(idtxt)
+
+	def begin_chunk(self, idtxt):
+		self.writer.raw(idtxt)
+		self.stack.append([self.writer.tell(), idtxt])
+		self.writer.int_u32(0)
+
+	def write(self, data): self.writer.raw(data)
+
+	def internal_end(self):
+		sizepos, idtxt = self.stack.pop()
+		endpos = self.writer.tell()
+		size = endpos-sizepos-4
+		if size > size_rf64: self.large_sizes[idtxt] = size
+		self.writer.seek(sizepos)
+		self.writer.int_u32(min(size, size_rf64))
+		self.writer.seek(endpos)
+		return size
+
+	def end_chunk(self):
+		if self.internal_end()%2: self.writer.raw(b'\0')
+
+	def end_list(self): self.internal_end()
+
+	def write_chunk(self, idtxt, data):
+		self.begin_chunk(idtxt)
+		self.writer.raw(data)
+		self.end_chunk()
+
+	def write_chunk_stream(self, idtxt, blocks):
+		self.begin_chunk(idtxt)
+		for x in blocks: self.writer.raw(x)
+		self.end_chunk()
+
+	def write_tree(self, chunk):
+		if chunk.is_list and chunk.is_header:
+			for x in chunk.indata: self.write_tree(x)
+		elif chunk.is_list:
+			self.begin_list(chunk.id)
+			for x in chunk.indata: self.write_tree(x)
+			self.end_list()
+		elif chunk.id != b'ds64':
+			self.write_chunk(chunk.id, chunk.data)
+
+	def internal_write_ds64(self):
+		table = [[k, v] for k, v in self.large_sizes.items() if k not in [b'RIFF', b'data']]
+		if self.ds64_pos is None: raise ValueError('riff_writer: size over 4GB without ds64 space reserved')
+		if len(table) > self.ds64_table_size: raise ValueError('riff_writer: not enough ds64 table entries reserved')
+		self.writer.seek(0)
+		self.writer.raw(b'RF64')
+		self.writer.seek(self.ds64_pos)
+		self.writer.raw(b'ds64')
+		self.writer.seek(self.ds64_pos+8)
+		self.writer.int_u64(self.size_riff)
+		self.writer.int_u64(self.large_sizes[b'data'] if b'data' in self.large_sizes else 0)
+		self.writer.int_u64(self.sample_count)
+		self.writer.int_u32(len(table))
+		for k, v in table:
+			self.writer.raw(k)
+			self.writer.int_u64(v)
+
+	def close(self, sample_count=None):
+		if sample_count is not None: self.sample_count = sample_count
+		while len(self.stack) > 1: self.internal_end()
+		if self.stack:
+			self.size_riff = self.writer.tell()-8
+			self.internal_end()
+			if self.large_sizes: self.internal_write_ds64()
+		self.writer.close()
+
+class riff_editor:
+	def __init__(self):
+		self.filename = None
+		self.file = None
+		self.reader = None
+		self.root = None
+		self.block_size = 1024*1024
+
+	def open_file(self, filename):
+		self.close()
+		self.filename = filename
+		self.file = open(filename, 'r+b')
+		self.reload()
+
+	def reload(self):
+		if self.reader is not None: self.reader.close()
+		self.root = riff_chunk()
+		self.reader = self.root.read_file(self.filename, False, True)
+
+	def close(self):
+		if self.reader is not None: self.reader.close()
+		if self.file is not None: self.file.close()
+		self.__init__()
+
+	def read_chunk(self, path):
+		chunk = self.root[path]
+		self.file.seek(chunk.start)
+		return self.file.read(chunk.size)
+
+	def replace(self, path, data):
+		chain = self.root.get_path_chain(path)
+		chunk = chain[-1]
+		if chunk.is_list: raise ValueError('riff_editor: cannot replace a list with data')
+		pos = chunk.start-8
+		oldspace = 8+chunk.size+(chunk.size%2)
+		parent = chain[-2]
+		num = parent.indata.index(chunk)
+		if num+1 < len(parent.indata) and parent.indata[num+1].id == b'JUNK':
+			junk = parent.indata[num+1]
+			oldspace += 8+junk.size+(junk.size%2)
+		self.internal_place(chain[:-1], pos, oldspace, self.internal_make_chunk(chunk.id, data))
+
+	def append(self, path, idtxt, data):
+		chain = self.root.get_path_chain(path)
+		listchunk = chain[-1]
+		if not listchunk.is_list: raise ValueError('riff_editor: can only append to a list')
+		pos = listchunk.end
+		oldspace = 0
+		if listchunk.indata and listchunk.indata[-1].id == b'JUNK':
+			junk = listchunk.indata[-1]
+			pos = junk.start-8
+			oldspace = 8+junk.size+(junk.size%2)
+		self.internal_place(chain, pos, oldspace, self.internal_make_chunk(idtxt, data))
+
+	def internal_make_chunk(self, idtxt, data):
+		outdata = idtxt+easybinrw.binwrite.pak_u32_l(len(data))+bytes(data)
+		if len(data)%2: outdata += b'\0'
+		return outdata
+
+	def internal_place(self, parents, pos, oldspace, newdata):
+		leftover = oldspace-len(newdata)
+		if leftover == 0 or leftover >= 8:
+			self.file.seek(pos)
+			self.file.write(newdata)
+			if leftover: self.file.write(b'JUNK'+easybinrw.binwrite.pak_u32_l(leftover-8))
+			self.file.flush()
+		else:
+			self.internal_splice(parents, pos, oldspace, newdata)
+		self.reload()
+
+	def internal_splice(self, parents, pos, oldspace, newdata):
+		for x in parents:
+			if x.size+4 > size_rf64: raise ValueError('riff_editor: resizing RF64 lists is not supported')
+		delta = len(newdata)-oldspace
+		filesize = os.path.getsize(self.filename)
+		self.reader.close()
+		self.reader = None
+		self.internal_move(pos+oldspace, pos+len(newdata), filesize-(pos+oldspace))
+		self.file.seek(pos)
+		self.file.write(newdata)
+		if delta < 0: self.file.truncate(filesize+delta)
+		for x in parents:
+			self.file.seek(x.start-4)
+			self.file.write(easybinrw.binwrite.pak_u32_l(x.size+4+delta))
+		self.file.flush()
+
+	def internal_move(self, src, dst, length):
+		if src == dst or not length: return
+		blocks = range(0, length, self.block_size)
+		if dst > src: blocks = reversed(blocks)
+		for offset in blocks:
+			size = min(self.block_size, length-offset)
+			self.file.seek(src+offset)
+			data = self.file.read(size)
+			self.file.seek(dst+offset)
+			self.file.write(data)
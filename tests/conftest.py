@@ -0,0 +1,18 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+import os
+import sys
+import types
+
+repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if 'external.easybinrw' not in sys.modules:
+	external = types.ModuleType('external')
+	external.__path__ = []
+	package = types.ModuleType('external.easybinrw')
+	package.__path__ = [repo_root]
+	external.easybinrw = package
+	sys.modules['external'] = external
+	sys.modules['external.easybinrw'] = package
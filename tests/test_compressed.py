@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+from external.easybinrw import easybinrw
+import bz2
+import gzip
+import lzma
+import pytest
+import random
+import zlib
+
+plain = bytes(random.Random(1).getrandbits(4) for _ in range(300000))
+
+packed = {
+	'zlib': zlib.compress(plain),
+	'gzip': gzip.compress(plain[:100000])+gzip.compress(plain[100000:]),
+	'bz2': bz2.compress(plain[:100000])+bz2.compress(plain[100000:]),
+	'lzma': lzma.compress(plain),
+	}
+
+@pytest.mark.parametrize('codec', list(packed))
+def test_random_access(codec):
+	reader = easybinrw.binread()
+	reader.load_compressed(packed[codec], window_size=4096, cache_windows=2, index_interval=16384)
+	assert reader.read(16) == plain[:16]
+	assert reader.str.size is None
+	rnd = random.Random(2)
+	for _ in range(200):
+		pos = rnd.randrange(len(plain)+100)
+		num = rnd.randrange(10000)
+		reader.seek(pos)
+		assert reader.read(num) == plain[pos:pos+num]
+	assert reader.find(plain[-6:], 0) == plain.find(plain[-6:])
+	assert reader.remaining() == max(0, len(plain)-reader.tell())
+	assert reader.state.end == len(plain)
+	if codec in ['zlib', 'gzip']: assert len(reader.str.checkpoints) > 2
+	reader.close()
+
+def test_rest_without_size():
+	reader = easybinrw.binread()
+	reader.load_compressed(packed['zlib'], window_size=4096)
+	reader.seek(10)
+	assert reader.rest() == plain[10:]
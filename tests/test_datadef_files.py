@@ -0,0 +1,30 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+from external.easybinrw import datadef
+import pytest
+import xml.etree.ElementTree as ET
+
+files_ddef = '''<datadef>
+  <struct name="main">
+    <part type="int_u32" name="value"/>
+  </struct>
+</datadef>'''
+
+@pytest.mark.parametrize('workers, ordered', [(1, True), (2, True), (2, False)])
+def test_parse_files_iterator(tmp_path, workers, ordered):
+	dataset = datadef.datadef_file()
+	dataset.read_xml(ET.fromstring(files_ddef))
+	paths = []
+	for num in range(20):
+		path = str(tmp_path/('%i.bin' % num))
+		with open(path, 'wb') as f: f.write(num.to_bytes(4, 'little'))
+		paths.append(path)
+	paths.append(str(tmp_path/'missing.bin'))
+	results = list(dataset.parse_files(iter(paths), 'main', workers, ordered, max_pending=3))
+	if ordered: assert [x[0] for x in results] == paths
+	found = dict([(x[0], x[1]) for x in results])
+	assert [found[x] for x in paths[:-1]] == [{'value': num} for num in range(20)]
+	assert found[paths[-1]] is None
+	assert isinstance([x[2] for x in results if x[0] == paths[-1]][0], FileNotFoundError)
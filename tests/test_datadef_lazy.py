@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+from external.easybinrw import datadef
+from external.easybinrw import easybinrw
+import pytest
+import xml.etree.ElementTree as ET
+
+lazy_ddef = '''<datadef>
+  <struct name="item">
+    <part type="string" name="name"><size type="int_u8"/></part>
+    <part type="int_u8" name="kind"/>
+    <match type="int_u8" match_value="1" name="kind"><part type="list" name="vals" list_type="int_u16"><size type="int_u8"/></part></match>
+    <match type="int_u8" match_value="2" name="kind"><part type="struct" name="sub" struct_name="sub"/></match>
+  </struct>
+  <struct name="sub">
+    <part type="raw" name="data"><size type="int_u8"/></part>
+    <part type="list" name="items" list_type="struct" struct_name="item"><size type="int_u8"/></part>
+  </struct>
+  <struct name="main">
+    <part type="int_u32" name="magic"/>
+    <part type="list" name="items" list_type="struct" struct_name="item"><size type="int_u32"/></part>
+    <part type="list" name="tail" list_type="dict"><size type="int_u32"/><part type="string" name="s"><size type="int_u8"/></part></part>
+  </struct>
+</datadef>'''
+
+def write_item(writer, num, depth):
+	name = b'item%i' % num
+	writer.int_u8(len(name))
+	writer.raw(name)
+	kind = num%3 if depth < 2 else num%2
+	writer.int_u8(kind)
+	if kind == 1:
+		writer.int_u8(num%4)
+		for x in range(num%4): writer.int_u16(x)
+	elif kind == 2:
+		writer.int_u8(3)
+		writer.raw(b'abc')
+		writer.int_u8(2)
+		write_item(writer, num+1, depth+1)
+		write_item(writer, num+2, depth+1)
+
+def make_data(count):
+	writer = easybinrw.binwrite()
+	writer.int_u32(77)
+	writer.int_u32(count)
+	for num in range(count): write_item(writer, num, 0)
+	writer.int_u32(2)
+	for x in [b'hi', b'x']:
+		writer.int_u8(len(x))
+		writer.raw(x)
+	return writer.getvalue()
+
+@pytest.mark.parametrize('use_compiled', [True, False])
+def test_lazy_variable_lists(use_compiled):
+	dataset = datadef.datadef_file()
+	dataset.read_xml(ET.fromstring(lazy_ddef))
+	dataset.use_compiled = use_compiled
+	data = make_data(100)
+	full = dataset.parse_data(data, 'main')
+	record = dataset.parse_data(data, 'main', lazy=True)
+	assert record['magic'] == 77
+	assert len(record['items'].offsets) == 100 and not record['items'].records
+	assert record['tail'].offsets is None
+	assert record['tail'][1].to_dict() == {'s': 'x'}
+	assert repr(record['items'][50].to_dict()) == repr(full['items'][50])
+	assert repr(datadef.lazy_to_value(record)) == repr(full)
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+from external.easybinrw import datadef
+from struct import pack
+import os
+import pytest
+import xml.etree.ElementTree as ET
+
+gumboy_ddef = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'example', 'gumboy_map.ddef')
+
+match_ddef = '''<datadef>
+  <struct name="main">
+    <part type="int_u8" name="kind"/>
+    <match type="int_u8" match_value="1" name="kind"><part type="int_u16" name="one"/></match>
+    <match type="int_u8" match_value="2" name="kind"><part type="int_u32" name="two"/></match>
+    <match type="int_u8" match_value="3" name="kind"><part type="float" name="three"/></match>
+    <match type="int_u8" match_value="0" name="kind" mode="ne"><part type="int_u8" name="tail"/></match>
+    <match type="int" match_value="5" name="kind" mode="lo"><part type="int_u8" name="small"/></match>
+  </struct>
+</datadef>'''
+
+def load_match(use_compiled):
+	dataset = datadef.datadef_file()
+	dataset.read_xml(ET.fromstring(match_ddef))
+	dataset.use_compiled = use_compiled
+	return dataset
+
+@pytest.mark.parametrize('use_compiled', [True, False])
+def test_int_typed_matches(use_compiled):
+	dataset = load_match(use_compiled)
+	assert dataset.parse_data(b'\x01\x34\x12\x07\x08', 'main') == {'kind': 1, 'one': 0x1234, 'tail': 7, 'small': 8}
+	assert dataset.parse_data(b'\x02\x01\x00\x00\x00\x09\x0a', 'main') == {'kind': 2, 'two': 1, 'tail': 9, 'small': 10}
+	assert dataset.parse_data(b'\x03\x00\x00\xc0\x3f\x09\x0a', 'main') == {'kind': 3, 'three': 1.5, 'tail': 9, 'small': 10}
+	assert dataset.parse_data(b'\x00\x0a', 'main') == {'kind': 0, 'small': 10}
+	assert dataset.parse_data(b'\x07\x0b', 'main') == {'kind': 7, 'tail': 11}
+
+@pytest.mark.parametrize('use_compiled', [True, False])
+def test_gumboy_props(use_compiled):
+	dataset = datadef.datadef_file()
+	dataset.load_from_file(gumboy_ddef)
+	dataset.use_compiled = use_compiled
+	data = pack('<III', 10, 1, 9)+b'prop data'
+	assert dataset.parse_data(data, 'prop_part') == {'prop_type': 10, 'data': {'unk_0': 1, 'unk_1': b'prop data'}}
+	data = pack('<II', 1, 4)+b'\x01\x00\x01\x00'+pack('<I', 5)+b'cmds1'+pack('<I', 5)+b'cmds3'
+	assert dataset.parse_data(data, 'prop_part') == {'prop_type': 1, 'data': {'size': 4, 'flag1': 1, 'flag2': 0, 'flag3': 1, 'flag4': 0, 'cmds1': b'cmds1', 'cmds3': b'cmds3'}}
+	assert dataset.parse_data(pack('<I', 0), 'prop_part') == {'prop_type': 0}
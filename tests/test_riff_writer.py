@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2024 SatyrDiamond
+# SPDX-License-Identifier: MIT
+# easybinrw is MIT
+
+from external.easybinrw import easybinrw
+from external.easybinrw import riff_chunks
+from struct import unpack_from
+
+def read_tree(filename):
+	reader = easybinrw.binread()
+	reader.load_file(filename)
+	riff_data = riff_chunks.riff_chunk()
+	riff_data.read(reader, True)
+	return reader, riff_data
+
+def test_rf64_sizes(tmp_path, monkeypatch):
+	monkeypatch.setattr(riff_chunks, 'size_rf64', 0x7F)
+	filename = str(tmp_path/'out.wav')
+	writer = riff_chunks.riff_writer()
+	writer.open_file(filename, b'WAVE', True, 1)
+	writer.write_chunk(b'fmt ', bytes(16))
+	writer.begin_list(b'adtl')
+	for num in range(8): writer.write_chunk(b'labl', b'label %i\x00' % num)
+	writer.end_list()
+	writer.write_chunk(b'data', bytes(range(200)))
+	writer.write_chunk(b'cue ', b'abcd')
+	writer.close(sample_count=100)
+
+	with open(filename, 'rb') as f: data = f.read()
+	assert data[:4] == b'RF64'
+	datapos = data.find(b'data\x7f\x00\x00\x00')
+	assert data[datapos+208:datapos+212] == b'cue '
+	ds64pos = data.find(b'ds64')
+	assert unpack_from('<QQQI4sQ', data, ds64pos+8) == (len(data)-8, 200, 100, 1, b'adtl', 8*16+4)
+
+	reader, riff_data = read_tree(filename)
+	assert [x.id for x in riff_data.indata] == [b'ds64', b'fmt ', b'adtl', b'data', b'cue ']
+	assert riff_data.indata[2].is_list and len(riff_data.indata[2].indata) == 8
+	assert riff_data.indata[3].data == bytes(range(200))
+	assert riff_data.indata[4].data == b'abcd'
+	reader.close()
+
+def test_write_tree_root(tmp_path):
+	riffdata = riff_chunks.riff_chunk()
+	riffdata.id = b'WAVE'
+	fmtchunk = riffdata.add_part(b'fmt ')
+	fmtchunk.data = bytes(16)
+	listchunk = riffdata.add_group(b'adtl')
+	labelchunk = listchunk.add_part(b'labl')
+	labelchunk.data = b'label\x00'
+	datachunk = riffdata.add_part(b'data')
+	datachunk.data = b'abc'
+	indata = riffdata.write_data()
+
+	reader = easybinrw.binread()
+	reader.load_data(indata)
+	riff_data = riff_chunks.riff_chunk()
+	riff_data.read(reader, True)
+	filename = str(tmp_path/'out.wav')
+	writer = riff_chunks.riff_writer()
+	writer.open_file(filename, b'WAVE', False)
+	writer.write_tree(riff_data)
+	writer.close()
+
+	with open(filename, 'rb') as f: data = f.read()
+	assert data == indata
+	assert b'LIST' not in data[:16]